@@ -0,0 +1,98 @@
+"""Benchmark rule evaluation order and the per-resource condition memo.
+
+Usage: python benchmarks/bench_engine.py [resource_count]
+
+Builds a ruleset where an expensive REGEX is listed before a cheap, selective
+EQUALS (and shared between rules), then times plain file-order all()
+evaluation against cost/selectivity ordering with the shared memo.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sis.engine import RuleEngine
+
+
+RULE_COUNT = 40
+
+
+def _ruleset() -> dict:
+    rules = []
+    for index in range(RULE_COUNT):
+        rules.append({
+            "rule_id": f"BENCH-{index:02d}",
+            "rule_type": "IRREVERSIBLE_DECISION",
+            "applies_to": {"file_types": ["terraform"], "resource_kinds": ["*"]},
+            "detection": {
+                "match_logic": "ALL",
+                "conditions": [
+                    {"path": "name", "operator": "REGEX", "value": r"^(\w+-)*prod(-\w+)*$"},
+                    {"path": "tags.team", "operator": "CONTAINS", "value": "platform"},
+                    {"path": "tier", "operator": "EQUALS", "value": f"tier-{index}"},
+                ],
+            },
+            "message": "Benchmark rule",
+        })
+    return {"ruleset_version": "bench", "rules": rules}
+
+
+def _resources(count: int) -> list:
+    return [
+        {
+            "name": f"svc-{index}-prod-eu-west",
+            "tags": {"team": "platform-core"},
+            "tier": f"tier-{index % (RULE_COUNT * 10)}",
+        }
+        for index in range(count)
+    ]
+
+
+def _file_order(rule):
+    # Unordered, unmemoized evaluation as the engine did it originally.
+    def evaluate(resource, memo=None):
+        return all(cond.evaluate(resource) for cond in rule.conditions)
+    return evaluate
+
+
+def _time_scan(engine: RuleEngine, resources: list) -> tuple:
+    start = time.perf_counter()
+    findings = [
+        engine.scan_resource("terraform", "aws_instance", resource)
+        for resource in resources
+    ]
+    return time.perf_counter() - start, findings
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    resources = _resources(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rules_file = os.path.join(tmp, "rules.json")
+        with open(rules_file, "w", encoding="utf-8") as handle:
+            json.dump(_ruleset(), handle)
+
+        baseline = RuleEngine(rules_file)
+        for rule in baseline.rules:
+            rule.evaluate = _file_order(rule)
+        ordered = RuleEngine(rules_file)
+
+        baseline_time, baseline_findings = _time_scan(baseline, resources)
+        ordered_time, ordered_findings = _time_scan(ordered, resources)
+
+    if baseline_findings != ordered_findings:
+        print("FAIL: ordered evaluation changed the findings")
+        return 1
+
+    matches = sum(len(findings) for findings in ordered_findings)
+    print(f"{count} resources x {RULE_COUNT} rules, {matches} findings")
+    print(f"  file order: {baseline_time * 1000:8.1f} ms")
+    print(f"  ordered:    {ordered_time * 1000:8.1f} ms "
+          f"({baseline_time / ordered_time:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
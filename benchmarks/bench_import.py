@@ -0,0 +1,70 @@
+"""Benchmark CLI import time with ``python -X importtime``.
+
+Usage: python benchmarks/bench_import.py [--module sis.cli] [--budget-ms 100]
+
+Exits non-zero if the median cumulative import time exceeds the budget or if
+a parser backend is imported eagerly.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+
+BUDGET_MS = 100.0
+RUNS = 5
+
+# Backends that must only load when a file of their type is parsed.
+LAZY_MODULES = ("yaml", "hcl2", "lark")
+
+
+def measure(module: str) -> Tuple[float, Dict[str, int]]:
+    """Return (cumulative ms for module, {imported module: cumulative us})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        imported[name.strip()] = int(cumulative)
+    return imported.get(module, 0) / 1000, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="sis.cli")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    timings = []
+    imported: Dict[str, int] = {}
+    for _ in range(args.runs):
+        elapsed, imported = measure(args.module)
+        timings.append(elapsed)
+
+    median = statistics.median(timings)
+    print(f"import {args.module}: median {median:.1f} ms "
+          f"(min {min(timings):.1f}, max {max(timings):.1f}, budget {args.budget_ms:.0f})")
+
+    status = 0
+    eager = sorted(name for name in imported if name.split(".")[0] in LAZY_MODULES)
+    if eager:
+        print("eagerly imported: " + ", ".join(eager))
+        status = 1
+    if median > args.budget_ms:
+        print("over budget")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+"""Measure peak RSS when reading large JSON inputs.
+
+Usage: python benchmarks/bench_io.py [size_mb]
+
+Each case runs in a fresh interpreter and reports its peak resident set size,
+comparing a plain text-mode read with sis.reader.read_source.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+CASES = {
+    "text-mode read": (
+        "with open(path, 'r', encoding='utf-8') as handle:\n"
+        "    content = handle.read()\n"
+        "parse_arm(content)\n"
+    ),
+    "read_source (mmap sniff)": (
+        "content = read_source(path, 'arm', max_size=1 << 40)\n"
+        "parse_arm(content)\n"
+    ),
+    "read_source (over limit)": (
+        "try:\n"
+        "    read_source(path, 'arm')\n"
+        "except FileTooLargeError:\n"
+        "    pass\n"
+    ),
+}
+
+PRELUDE = (
+    "import resource, sys\n"
+    "from sis.parsers.arm import parse_arm\n"
+    "from sis.reader import FileTooLargeError, read_source\n"
+    "path = sys.argv[1]\n"
+)
+
+REPORT = "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+
+
+def _generate(path: str, size_mb: int) -> None:
+    # A large generated JSON document that is not an ARM template.
+    row = json.dumps({"id": "x" * 64, "values": list(range(20))})
+    rows = (size_mb * 1024 * 1024) // (len(row) + 2)
+    # Written row by row so this process stays small; children started from
+    # it would otherwise report its peak RSS as their own.
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write('{"items": [')
+        for index in range(rows):
+            handle.write(",\n" + row if index else row)
+        handle.write("]}")
+
+
+def main() -> int:
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "generated.json")
+        _generate(path, size_mb)
+        actual_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"input: {actual_mb:.0f} MB non-ARM JSON")
+
+        baseline = subprocess.run(
+            [sys.executable, "-c", PRELUDE + REPORT, path],
+            capture_output=True, text=True, check=True,
+        )
+        base_kb = int(baseline.stdout)
+        print(f"{'interpreter baseline':<28} {base_kb / 1024:8.1f} MB")
+
+        for label, body in CASES.items():
+            result = subprocess.run(
+                [sys.executable, "-c", PRELUDE + body + REPORT, path],
+                capture_output=True, text=True, check=True,
+            )
+            print(f"{label:<28} {int(result.stdout) / 1024:8.1f} MB peak RSS")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
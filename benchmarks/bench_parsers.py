@@ -0,0 +1,86 @@
+"""Benchmark ARM and Docker Compose parsing on large generated inputs.
+
+Usage: python benchmarks/bench_parsers.py [resource_count]
+"""
+import json
+import sys
+import time
+
+import yaml
+
+from sis.parsers.arm import parse_arm
+from sis.parsers.docker_compose import parse_docker_compose
+
+
+def _arm_template(count: int) -> str:
+    resources = []
+    for index in range(count):
+        resources.append({
+            "type": "Microsoft.Sql/servers",
+            "name": f"sql{index}",
+            "apiVersion": "2021-11-01",
+            "location": "eastus",
+            "properties": {"administratorLogin": "admin", "version": "12.0"},
+            "resources": [
+                {"type": "databases", "name": "db", "properties": {"sku": "S0"}},
+            ],
+        })
+    resources.append({
+        "type": "Microsoft.Network/publicIPAddresses",
+        "name": "[concat('ip', copyIndex())]",
+        "copy": {"name": "ips", "count": count},
+    })
+    return json.dumps({
+        "$schema": "https://schema.management.azure.com/schemas/2019-04-01/deploymentTemplate.json#",
+        "contentVersion": "1.0.0.0",
+        "resources": resources,
+    })
+
+
+def _non_arm_json(count: int) -> str:
+    return json.dumps({
+        "name": "package",
+        "dependencies": {f"dep{index}": "^1.0.0" for index in range(count * 10)},
+    })
+
+
+def _compose(count: int) -> str:
+    return yaml.safe_dump({
+        "services": {
+            f"svc{index}": {
+                "image": "nginx:latest",
+                "ports": [f"{8000 + index}:80"],
+                "environment": {"MODE": "prod"},
+                "volumes": [f"data{index}:/data"],
+            }
+            for index in range(count)
+        },
+        "volumes": {f"data{index}": None for index in range(count)},
+        "networks": {"backend": {"driver": "bridge"}},
+    })
+
+
+def _timed(label: str, func, content: str, repeat: int = 3) -> None:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content)
+        best = min(best, time.perf_counter() - start)
+    size_mb = len(content) / (1024 * 1024)
+    print(f"{label:<28} {size_mb:7.2f} MB {best * 1000:9.1f} ms {len(result):7d} resources")
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    _timed("arm template", parse_arm, _arm_template(count))
+    _timed("non-arm json (sniffed)", parse_arm, _non_arm_json(count))
+    compose = _compose(count)
+    _timed("compose (libyaml)", parse_docker_compose, compose)
+    _timed("compose (pure python)", lambda c: yaml.safe_load(c)["services"], compose, 1)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
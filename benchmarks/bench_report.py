@@ -0,0 +1,87 @@
+"""Benchmark report generation on a large generated scan payload.
+
+Usage: python benchmarks/bench_report.py [finding_count]
+
+Each case runs in a fresh interpreter and reports wall time and peak RSS.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+CASES = {
+    "load + render (in memory)": (
+        "import json\n"
+        "from sis.report import render_markdown_report\n"
+        "with open(src, encoding='utf-8') as handle:\n"
+        "    payload = json.load(handle)\n"
+        "with open(dst, 'w', encoding='utf-8') as handle:\n"
+        "    handle.write(render_markdown_report(payload))\n"
+    ),
+    "sis report (markdown)": (
+        "import sys\n"
+        "from sis.cli import main\n"
+        "sys.argv = ['sis', 'report', '-i', src, '-o', dst]\n"
+        "main()\n"
+    ),
+    "sis report (sarif)": (
+        "import sys\n"
+        "from sis.cli import main\n"
+        "sys.argv = ['sis', 'report', '-i', src, '-o', dst, '--format', 'sarif']\n"
+        "main()\n"
+    ),
+}
+
+PRELUDE = "import resource, sys\nsrc, dst = sys.argv[1], sys.argv[2]\n"
+REPORT = "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+
+
+def _generate(path: str, count: int) -> None:
+    # Written finding by finding so this process stays small; children
+    # started from it would otherwise report its peak RSS as their own.
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write('{"target": "generated", "rules": "rules/demo.json", ')
+        handle.write(f'"total_files": {count // 10}, "findings": [')
+        for index in range(count):
+            finding = {
+                "rule_id": "IRR-DEC-01",
+                "rule_type": "IRREVERSIBLE_DECISION",
+                "message": "Resource has deletion protection enabled.",
+                "resource_kind": "google_compute_instance",
+                "resource_name": f"vm{index}",
+                "file": f"modules/m{index // 10}/main.tf",
+                "line": 1,
+            }
+            handle.write(("," if index else "") + json.dumps(finding))
+        handle.write('], "summary": {"total_findings": ' + str(count))
+        handle.write(', "by_type": {"IRREVERSIBLE_DECISION": ' + str(count) + "}}")
+        handle.write(', "errors": []}')
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with tempfile.TemporaryDirectory() as directory:
+        src = os.path.join(directory, "scan.json")
+        dst = os.path.join(directory, "report.out")
+        _generate(src, count)
+        size_mb = os.path.getsize(src) / (1024 * 1024)
+        print(f"input: {count} findings, {size_mb:.1f} MB")
+
+        for label, body in CASES.items():
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-c", PRELUDE + body + REPORT, src, dst],
+                capture_output=True, text=True, check=True,
+            )
+            elapsed = time.perf_counter() - start
+            peak_kb = int(result.stdout.split()[-1])
+            print(f"{label:<28} {elapsed:6.2f} s {peak_kb / 1024:8.1f} MB peak RSS")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
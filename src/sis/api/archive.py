@@ -0,0 +1,104 @@
+"""Archive upload helpers for the SIS API."""
+from typing import BinaryIO, Iterator, Tuple
+import tarfile
+import zipfile
+import zlib
+
+
+CHUNK_SIZE = 64 * 1024
+
+# What tarfile, zipfile and the decompressors raise for truncated, corrupt,
+# encrypted or unsupported input, while opening or reading a member.
+CORRUPT_ARCHIVE_ERRORS = (
+    tarfile.TarError,
+    zipfile.BadZipFile,
+    zlib.error,
+    EOFError,
+    OSError,
+    RuntimeError,
+    NotImplementedError,
+)
+
+
+class ArchiveError(ValueError):
+    """Raised when an uploaded archive cannot be read."""
+
+
+class ArchiveLimitError(ArchiveError):
+    """Raised when an uploaded archive exceeds a size or member limit."""
+
+
+def _read_limited(
+    handle: BinaryIO, name: str, max_member_size: int, remaining: int
+) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        chunk = handle.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_member_size:
+            raise ArchiveLimitError(f"Member too large: {name}")
+        if size > remaining:
+            raise ArchiveLimitError("Archive content too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _iter_tar(fileobj: BinaryIO) -> Iterator[Tuple[str, BinaryIO]]:
+    try:
+        # Stream mode reads members sequentially without seeking or
+        # extracting anything to disk.
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                handle = archive.extractfile(member)
+                if handle is not None:
+                    yield member.name, handle
+    except CORRUPT_ARCHIVE_ERRORS as exc:
+        raise ArchiveError(f"Invalid archive: {exc}") from exc
+
+
+def _iter_zip(fileobj: BinaryIO) -> Iterator[Tuple[str, BinaryIO]]:
+    try:
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as handle:
+                    yield info.filename, handle
+    except CORRUPT_ARCHIVE_ERRORS as exc:
+        raise ArchiveError(f"Invalid archive: {exc}") from exc
+
+
+def iter_archive_members(
+    fileobj: BinaryIO,
+    max_members: int,
+    max_member_size: int,
+    max_total_size: int,
+) -> Iterator[Tuple[str, bytes]]:
+    """Yield (name, content) for each regular file in a tar(.gz) or zip archive.
+
+    Limits are enforced while reading, so an oversized archive is rejected as
+    soon as a limit is crossed rather than after it has been fully inflated.
+    """
+    is_zip = fileobj.seekable() and zipfile.is_zipfile(fileobj)
+    if fileobj.seekable():
+        fileobj.seek(0)
+    members = _iter_zip(fileobj) if is_zip else _iter_tar(fileobj)
+
+    count = 0
+    total = 0
+    for name, handle in members:
+        count += 1
+        if count > max_members:
+            raise ArchiveLimitError("Too many archive members")
+        # Member data is decompressed here, outside the iterators' handlers.
+        try:
+            content = _read_limited(handle, name, max_member_size, max_total_size - total)
+        except CORRUPT_ARCHIVE_ERRORS as exc:
+            raise ArchiveError(f"Invalid archive member {name}: {exc}") from exc
+        total += len(content)
+        yield name, content
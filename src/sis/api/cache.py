@@ -0,0 +1,141 @@
+"""Per-file scan result cache for the SIS API."""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+
+
+Results = Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]
+
+# Names this cache creates under its directory: one subdirectory per ruleset,
+# and the flat per-entry files of the original layout.
+_RULESET_DIR = re.compile(r"[0-9a-f]{16}")
+_LEGACY_ENTRY = re.compile(r"[0-9a-f]{64}\.json|.*\.tmp")
+
+
+class ScanCache:
+    """LRU cache of per-file results with an optional on-disk tier.
+
+    Entries are keyed by (ruleset, file type, content hash) so the same file
+    submitted under a different name or in another request is a hit. Cached
+    results are stored without the file name; callers fill it in. On disk,
+    each ruleset gets its own subdirectory and only the current one is kept.
+    """
+
+    def __init__(
+        self, ruleset: str, max_entries: int = 1024, directory: Optional[str] = None
+    ):
+        self.ruleset = ruleset
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Results]" = OrderedDict()
+        if directory:
+            self._prune_disk()
+
+    def key(self, file_type: str, content: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{self.ruleset}\0{file_type}\0".encode("utf-8"))
+        digest.update(content.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _ruleset_dir(self) -> str:
+        digest = hashlib.sha256(self.ruleset.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:16])
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._ruleset_dir(), f"{key}.json")
+
+    def _prune_disk(self) -> None:
+        # Entries of other rulesets can never be hit again; remove them.
+        current = os.path.basename(self._ruleset_dir())
+        os.makedirs(self._ruleset_dir(), exist_ok=True)
+        for entry in os.scandir(self.directory):
+            if entry.name == current:
+                continue
+            if entry.is_dir() and _RULESET_DIR.fullmatch(entry.name):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            elif entry.is_file() and _LEGACY_ENTRY.fullmatch(entry.name):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def _read_disk(self, key: str) -> Optional[Results]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as handle:
+                findings, errors = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        return findings, errors
+
+    def _write_disk(self, key: str, value: Results) -> None:
+        if not self.directory:
+            return
+        # Write to a temp file and rename so readers never see partial JSON.
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self._ruleset_dir(), suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(list(value), handle)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _remember(self, key: str, value: Results) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Results]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self._remember(key, value)
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Results) -> None:
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def invalidate(self, ruleset: str) -> None:
+        """Drop cached entries and switch to a new ruleset."""
+        with self._lock:
+            self.ruleset = ruleset
+            self._entries.clear()
+            if self.directory:
+                self._prune_disk()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ruleset": self.ruleset,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
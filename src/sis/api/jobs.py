@@ -0,0 +1,305 @@
+"""Asynchronous scan jobs for the SIS API."""
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+import json
+import sqlite3
+import threading
+import time
+import uuid
+
+from sis.api.schemas import JobStatus
+
+
+ScanFn = Callable[[str, str, str], Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    api_key TEXT NOT NULL,
+    scan_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    files_total INTEGER NOT NULL,
+    files_done INTEGER NOT NULL DEFAULT 0,
+    summary TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (job_id, kind, seq)
+);
+"""
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot accept more work."""
+
+
+class JobStore:
+    """SQLite-backed job and result store with TTL-based cleanup."""
+
+    def __init__(self, path: str = ":memory:", ttl: float = 3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def create(self, api_key: str, scan_id: str, files_total: int) -> str:
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, api_key, scan_id, status, files_total,"
+                " created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, api_key, scan_id, JobStatus.QUEUED.value, files_total, now, now),
+            )
+        return job_id
+
+    def set_status(
+        self, job_id: str, status: JobStatus, summary: Optional[Dict[str, Any]] = None
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, summary = COALESCE(?, summary),"
+                " updated_at = ? WHERE job_id = ?",
+                (
+                    JobStatus(status).value,
+                    json.dumps(summary) if summary is not None else None,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def add_results(
+        self,
+        job_id: str,
+        findings: List[Dict[str, Any]],
+        errors: List[Dict[str, Any]],
+    ) -> None:
+        """Append one file's results and advance the progress counter."""
+        with self._lock, self._conn:
+            for kind, items in (("finding", findings), ("error", errors)):
+                if not items:
+                    continue
+                start = self._conn.execute(
+                    "SELECT COUNT(*) FROM results WHERE job_id = ? AND kind = ?",
+                    (job_id, kind),
+                ).fetchone()[0]
+                self._conn.executemany(
+                    "INSERT INTO results (job_id, seq, kind, payload)"
+                    " VALUES (?, ?, ?, ?)",
+                    [
+                        (job_id, start + offset, kind, json.dumps(item))
+                        for offset, item in enumerate(items)
+                    ],
+                )
+            self._conn.execute(
+                "UPDATE jobs SET files_done = files_done + 1, updated_at = ?"
+                " WHERE job_id = ?",
+                (time.time(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["summary"] = json.loads(job["summary"]) if job["summary"] else None
+        return job
+
+    def count_results(self, job_id: str, kind: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM results WHERE job_id = ? AND kind = ?",
+                (job_id, kind),
+            ).fetchone()[0]
+
+    def results(
+        self, job_id: str, kind: str, offset: int = 0, limit: int = -1
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM results WHERE job_id = ? AND kind = ?"
+                " ORDER BY seq LIMIT ? OFFSET ?",
+                (job_id, kind, limit, offset),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_results(
+        self, job_id: str, kind: str, batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield results in order, fetching one batch at a time."""
+        offset = 0
+        while True:
+            batch = self.results(job_id, kind, offset, batch_size)
+            if not batch:
+                return
+            yield from batch
+            offset += len(batch)
+
+    def purge_expired(self) -> int:
+        """Delete jobs (and their results) not updated within the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock, self._conn:
+            expired = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE updated_at < ? AND status IN (?, ?)",
+                    (cutoff, JobStatus.COMPLETED.value, JobStatus.FAILED.value),
+                )
+            ]
+            for job_id in expired:
+                self._conn.execute("DELETE FROM results WHERE job_id = ?", (job_id,))
+                self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        return len(expired)
+
+
+class FairQueue:
+    """Bounded queue that hands out work round-robin across API keys.
+
+    A client that submits many jobs only gets one turn per rotation, so a
+    single key cannot starve everyone else.
+    """
+
+    def __init__(self, max_pending: int = 100, max_per_key: int = 10):
+        self.max_pending = max_pending
+        self.max_per_key = max_per_key
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[Any]] = {}
+        self._keys: Deque[str] = deque()
+        self._pending = 0
+
+    def put(self, key: str, item: Any) -> None:
+        with self._cond:
+            queue = self._queues.get(key)
+            if self._pending >= self.max_pending:
+                raise QueueFullError("Job queue is full")
+            if queue is not None and len(queue) >= self.max_per_key:
+                raise QueueFullError("Too many pending jobs for this API key")
+            if queue is None:
+                queue = self._queues[key] = deque()
+                self._keys.append(key)
+            queue.append(item)
+            self._pending += 1
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Return the next item, or None if none arrives within the timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._keys, timeout):
+                return None
+            key = self._keys.popleft()
+            queue = self._queues[key]
+            item = queue.popleft()
+            if queue:
+                self._keys.append(key)
+            else:
+                del self._queues[key]
+            self._pending -= 1
+            return item
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._pending
+
+
+class JobManager:
+    """Runs queued scan jobs on a fixed pool of background worker threads.
+
+    Expired jobs are purged at most once per purge_interval (capped at the
+    store's TTL): on submit, on lookup, and by the workers between jobs.
+    """
+
+    def __init__(
+        self,
+        scan_fn: ScanFn,
+        store: JobStore,
+        workers: int = 2,
+        max_pending: int = 100,
+        max_per_key: int = 10,
+        purge_interval: float = 60,
+    ):
+        self.scan_fn = scan_fn
+        self.store = store
+        self.workers = workers
+        self.queue = FairQueue(max_pending, max_per_key)
+        self.purge_interval = min(purge_interval, store.ttl)
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._purge_lock = threading.Lock()
+        self._last_purge = float("-inf")
+
+    def purge_expired(self) -> int:
+        """Purge expired jobs unless that was done within purge_interval."""
+        now = time.monotonic()
+        with self._purge_lock:
+            if now - self._last_purge < self.purge_interval:
+                return 0
+            self._last_purge = now
+        return self.store.purge_expired()
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"sis-job-{index}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(
+        self, api_key: str, scan_id: str, files: List[Tuple[str, str, str]]
+    ) -> str:
+        """Queue (name, file_type, content) files and return the job id."""
+        self.purge_expired()
+        job_id = self.store.create(api_key, scan_id, len(files))
+        try:
+            self.queue.put(api_key, (job_id, files))
+        except QueueFullError:
+            self.store.set_status(job_id, JobStatus.FAILED)
+            raise
+        self._ensure_started()
+        return job_id
+
+    def run_job(self, job_id: str, files: List[Tuple[str, str, str]]) -> None:
+        self.store.set_status(job_id, JobStatus.RUNNING)
+        by_type = {
+            "IRREVERSIBLE_IDENTITY_BINDING": 0,
+            "IRREVERSIBLE_DECISION": 0,
+            "ADMIN_OVERRIDE_DEPENDENCY": 0,
+        }
+        total_findings = 0
+        try:
+            for name, file_type, content in files:
+                findings, errors = self.scan_fn(name, file_type, content)
+                for finding in findings:
+                    by_type[finding["rule_type"]] += 1
+                total_findings += len(findings)
+                self.store.add_results(job_id, findings, errors)
+        except Exception:
+            self.store.set_status(job_id, JobStatus.FAILED)
+            return
+
+        self.store.set_status(job_id, JobStatus.COMPLETED, {
+            "total_files": len(files),
+            "total_findings": total_findings,
+            "by_type": by_type,
+        })
+
+    def _worker(self) -> None:
+        while True:
+            item = self.queue.get(timeout=max(self.purge_interval, 1))
+            if item is not None:
+                job_id, files = item
+                self.run_job(job_id, files)
+            self.purge_expired()
@@ -16,12 +16,12 @@ class RuleType(str, Enum):
     ADMIN_OVERRIDE = "ADMIN_OVERRIDE_DEPENDENCY"
 
 class ScanFile(BaseModel):
-    name: str = Field(..., max_length=255, regex=r'^[a-zA-Z0-9_\-\.]+$')
+    name: str = Field(..., max_length=255, pattern=r'^[a-zA-Z0-9_\-\.]+$')
     type: FileType
     content: str = Field(..., max_length=1048576)
 
 class ScanRequest(BaseModel):
-    scan_id: Optional[str] = Field(None, regex=r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+    scan_id: Optional[str] = Field(None, pattern=r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
     files: List[ScanFile] = Field(..., max_items=100)
 
 class Finding(BaseModel):
@@ -53,4 +53,30 @@ class ScanResponse(BaseModel):
 class ErrorResponse(BaseModel):
     error: str
     message: str
-    retry_after: Optional[int] = None
\ No newline at end of file
+    retry_after: Optional[int] = None
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class JobProgress(BaseModel):
+    files_done: int
+    files_total: int
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    scan_id: str
+    status: JobStatus
+
+class JobResponse(BaseModel):
+    job_id: str
+    scan_id: str
+    status: JobStatus
+    progress: JobProgress
+    summary: Optional[Summary] = None
+    findings: List[Finding]
+    errors: List[FileError]
+    offset: int
+    next_offset: Optional[int] = None
@@ -2,13 +2,18 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
-from typing import Dict, List, Any, Iterable, Tuple
+import sys
+from typing import Dict, List, Any, Iterable, Iterator, TextIO, Tuple
 
 from sis.engine import RuleEngine
 from sis.parsers import parse_file
-from sis.report import render_markdown_report
+from sis.reader import DEFAULT_MAX_FILE_SIZE, FileTooLargeError, read_source
+from sis.jsonstream import iter_array_member, read_members
+from sis.report import write_markdown_report, write_sarif_report
+from sis.shard import ShardError, merge_partials, parse_shard, shard_of
 
 
 KNOWN_EXTENSIONS = {
@@ -25,8 +30,10 @@ def _iter_files(target: str) -> Iterable[str]:
         yield target
         return
 
-    for root, _, files in os.walk(target):
-        for name in files:
+    # Sorted so output order (and shard merging) is deterministic.
+    for root, dirs, files in os.walk(target):
+        dirs.sort()
+        for name in sorted(files):
             yield os.path.join(root, name)
 
 
@@ -43,15 +50,16 @@ def _detect_type(path: str, override: str | None) -> str | None:
 
 
 def _scan_file(
-    engine: RuleEngine, path: str, file_type: str
+    engine: RuleEngine,
+    path: str,
+    file_type: str,
+    max_size: int = DEFAULT_MAX_FILE_SIZE,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     findings: List[Dict[str, Any]] = []
     errors: List[Dict[str, Any]] = []
 
     try:
-        with open(path, "r", encoding="utf-8") as handle:
-            content = handle.read()
-
+        content = read_source(path, file_type, max_size)
         resources = parse_file(file_type, content)
         for resource in resources:
             resource_findings = engine.scan_resource(
@@ -67,6 +75,12 @@ def _scan_file(
                 })
 
             findings.extend(resource_findings)
+    except FileTooLargeError as exc:
+        errors.append({
+            "file": path,
+            "error": "FILE_TOO_LARGE",
+            "message": str(exc),
+        })
     except Exception as exc:
         errors.append({
             "file": path,
@@ -101,13 +115,57 @@ def _write_output(output: str, path: str | None) -> None:
         handle.write(output)
 
 
+@contextlib.contextmanager
+def _open_output(path: str | None) -> Iterator[TextIO]:
+    if not path:
+        yield sys.stdout
+        return
+    # Written next to the destination and renamed into place on success, so
+    # a failure part-way leaves any existing file untouched.
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            yield handle
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
+def _build_payload(
+    target: str,
+    rules: str,
+    total_files: int,
+    findings: List[Dict[str, Any]],
+    errors: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    return {
+        "target": target,
+        "rules": rules,
+        "total_files": total_files,
+        "findings": findings,
+        "summary": _summarize(findings),
+        "errors": errors,
+    }
+
+
 def scan_command(args: argparse.Namespace) -> int:
     engine = RuleEngine(args.rules)
 
     all_findings: List[Dict[str, Any]] = []
     all_errors: List[Dict[str, Any]] = []
+    terraform_paths: List[str] = []
+
+    paths = list(_iter_files(args.target))
+    if args.shard:
+        index, count = args.shard
+        paths = [
+            path for path in paths
+            if shard_of(path, args.target, count) == index
+        ]
 
-    for path in _iter_files(args.target):
+    for path in paths:
         file_type = _detect_type(path, args.type)
         if not file_type:
             if args.strict:
@@ -118,22 +176,41 @@ def scan_command(args: argparse.Namespace) -> int:
                 })
             continue
 
-        findings, errors = _scan_file(engine, path, file_type)
+        # Module resolution only covers .tf/.tf.json files, as Terraform
+        # does; other files forced to terraform with --type are scanned alone.
+        if (
+            args.terraform_project
+            and file_type == "terraform"
+            and path.lower().endswith((".tf", ".tf.json"))
+        ):
+            terraform_paths.append(path)
+            continue
+
+        findings, errors = _scan_file(engine, path, file_type, args.max_file_size)
+        all_findings.extend(findings)
+        all_errors.extend(errors)
+
+    if terraform_paths:
+        # Imported here: it pulls in python-hcl2 at import time.
+        from sis.terraform_project import TerraformProject
+
+        project = TerraformProject(engine, args.max_file_size)
+        findings, errors = project.scan(terraform_paths)
         all_findings.extend(findings)
         all_errors.extend(errors)
 
     summary = _summarize(all_findings)
 
     if args.format == "json":
-        payload = {
-            "target": args.target,
-            "rules": args.rules,
-            "total_files": len(list(_iter_files(args.target))),
-            "findings": all_findings,
-            "summary": summary,
-            "errors": all_errors,
-        }
+        payload = _build_payload(
+            args.target, args.rules, len(paths), all_findings, all_errors
+        )
+        if args.shard:
+            payload["shard"] = {"index": args.shard[0], "count": args.shard[1]}
         _write_output(json.dumps(payload, indent=2), args.output)
+    elif args.format == "sarif":
+        with _open_output(args.output) as handle:
+            write_sarif_report(handle, all_findings, all_errors)
     else:
         lines = [
             f"Target: {args.target}",
@@ -149,21 +226,145 @@ def scan_command(args: argparse.Namespace) -> int:
         if all_findings:
             lines.append("Findings:")
             for finding in all_findings:
-                lines.append(
+                line = (
                     f"  {finding['file']}:{finding['line']} "
                     f"{finding['rule_id']} {finding['message']}"
                 )
+                if "root" in finding:
+                    via = " ".join(filter(None, [finding["root"], finding["module"]]))
+                    line += f" (root: {via})"
+                lines.append(line)
         _write_output("\n".join(lines) + "\n", args.output)
 
     return 0 if not all_errors else 2
 
 
-def report_command(args: argparse.Namespace) -> int:
-    with open(args.input, "r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+def merge_command(args: argparse.Namespace) -> int:
+    partials = []
+    for path in args.inputs:
+        with open(path, "r", encoding="utf-8") as handle:
+            partials.append(json.load(handle))
+
+    try:
+        merged = merge_partials(partials)
+    except ShardError as exc:
+        print(f"sis merge: {exc}")
+        return 1
+
+    payload = _build_payload(
+        merged["target"],
+        merged["rules"],
+        merged["total_files"],
+        merged["findings"],
+        merged["errors"],
+    )
+    _write_output(json.dumps(payload, indent=2), args.output)
+    return 0 if not payload["errors"] else 2
+
+
+def _size_arg(value: str) -> int:
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = value.strip().upper().rstrip("B")
+    multiplier = units.get(text[-1:], 1)
+    if text[-1:] in units:
+        text = text[:-1]
+    try:
+        size = int(text) * multiplier
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid size '{value}'") from exc
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid size '{value}'")
+    return size
+
+
+def _shard_arg(value: str) -> Tuple[int, int]:
+    try:
+        return parse_shard(value)
+    except ShardError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def rules_test_command(args: argparse.Namespace) -> int:
+    # Imported here: only this subcommand needs the conformance runner.
+    from sis.rules.conformance import load_rule_definitions, run_conformance
+
+    rules, load_errors = load_rule_definitions(args.paths)
+    results = run_conformance(
+        rules,
+        jobs=args.jobs,
+        cache_path=None if args.no_cache else args.cache,
+        repeat=args.repeat,
+    )
+    failed = bool(load_errors) or any(r["status"] == "fail" for r in results)
+
+    if args.format == "json":
+        payload = {"results": results, "errors": load_errors}
+        _write_output(json.dumps(payload, indent=2), args.output)
+        return 1 if failed else 0
+
+    lines = []
+    for result in results:
+        timing = (
+            f"{result['eval_us']:.1f} us/eval" if result["eval_us"] is not None else "-"
+        )
+        cached = " (cached)" if result["cached"] else ""
+        lines.append(
+            f"{result['status'].upper():<9}{result['rule_id']:<16}"
+            f"{result['cases']:>3} cases  {timing}{cached}  {result['source']}"
+        )
+        for failure in result["failures"]:
+            lines.append(f"    {failure}")
+        for check in result["regex"]:
+            if check["status"] != "ok":
+                lines.append(
+                    f"    REGEX {check['pattern']!r} {check['status']}: {check['detail']}"
+                )
+    for error in load_errors:
+        lines.append(f"ERROR    {error['file']}: {error['message']}")
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    cached_count = sum(1 for result in results if result["cached"])
+    lines.append(
+        f"Rules: {len(results)} "
+        + " ".join(f"{status}={count}" for status, count in sorted(counts.items()))
+        + f" cached={cached_count}"
+    )
+    _write_output("\n".join(lines) + "\n", args.output)
+    return 1 if failed else 0
 
-    report = render_markdown_report(payload)
-    _write_output(report, args.output)
+
+def rules_profile_command(args: argparse.Namespace) -> int:
+    engine = RuleEngine(args.rules)
+    engine.profiling = True
+
+    errors: List[Dict[str, Any]] = []
+    for path in _iter_files(args.target):
+        file_type = _detect_type(path, args.type)
+        if file_type:
+            errors.extend(_scan_file(engine, path, file_type, args.max_file_size)[1])
+
+    written = engine.save_profile(args.output)
+    for error in errors:
+        print(f"ERROR    {error['file']}: {error['message']}")
+    print(f"Profiled {len(engine.stats)} conditions; wrote {written}")
+    return 0 if not errors else 2
+
+
+def report_command(args: argparse.Namespace) -> int:
+    # Findings and errors are streamed from the input, one pass each, and
+    # written straight to the output instead of loading the whole payload.
+    # Each pass scans past the other arrays without decoding them.
+    findings = iter_array_member(args.input, "findings")
+    errors = iter_array_member(args.input, "errors")
+
+    with _open_output(args.output) as handle:
+        if args.format == "sarif":
+            write_sarif_report(handle, findings, errors)
+        else:
+            context = read_members(args.input, skip={"findings", "errors"})
+            write_markdown_report(handle, context, findings, errors)
     return 0
 
 
@@ -204,9 +405,30 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Error on unknown file types",
     )
+    scan.add_argument(
+        "--terraform-project",
+        action="store_true",
+        help="Resolve local Terraform modules and attribute their findings "
+        "to each calling root module",
+    )
+    scan.add_argument(
+        "--max-file-size",
+        type=_size_arg,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="SIZE",
+        help="Skip files larger than SIZE (bytes, or with K/M/G suffix) "
+        "and report FILE_TOO_LARGE (default 10M)",
+    )
+    scan.add_argument(
+        "--shard",
+        type=_shard_arg,
+        metavar="i/N",
+        help="Scan only shard i of N (1-based) and write a partial JSON "
+        "result for sis merge",
+    )
     scan.add_argument(
         "--format",
-        choices=["json", "text"],
+        choices=["json", "text", "sarif"],
         default="text",
         help="Output format",
     )
@@ -217,6 +439,111 @@ def build_parser() -> argparse.ArgumentParser:
     )
     scan.set_defaults(func=scan_command)
 
+    merge = subparsers.add_parser(
+        "merge",
+        help="Merge partial JSON results from sharded scans",
+    )
+    merge.add_argument(
+        "inputs",
+        nargs="+",
+        help="Partial JSON results written by sis scan --shard",
+    )
+    merge.add_argument(
+        "-o",
+        "--output",
+        help="Write output to a file instead of stdout",
+    )
+    merge.set_defaults(func=merge_command)
+
+    rules = subparsers.add_parser("rules", help="Rule development tools")
+    rules_subparsers = rules.add_subparsers(dest="rules_command", required=True)
+    rules_test = rules_subparsers.add_parser(
+        "test",
+        help="Run rules against their positive/negative fixtures",
+    )
+    rules_test.add_argument(
+        "paths",
+        nargs="*",
+        default=["tests/test_vectors"],
+        help="Rule files, test vectors or directories (default tests/test_vectors)",
+    )
+    rules_test.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes",
+    )
+    rules_test.add_argument(
+        "--cache",
+        default=".sis-rules-cache.json",
+        help="Result cache file, keyed by rule hash",
+    )
+    rules_test.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run every rule and do not write the cache",
+    )
+    rules_test.add_argument(
+        "--repeat",
+        type=int,
+        default=100,
+        help="Evaluations per fixture when timing rules",
+    )
+    rules_test.add_argument(
+        "--format",
+        choices=["json", "text"],
+        default="text",
+        help="Output format",
+    )
+    rules_test.add_argument(
+        "-o",
+        "--output",
+        help="Write output to a file instead of stdout",
+    )
+    rules_test.set_defaults(func=rules_test_command)
+
+    rules_profile = rules_subparsers.add_parser(
+        "profile",
+        help="Record condition match rates to tune evaluation order",
+    )
+    rules_profile.add_argument(
+        "-r",
+        "--rules",
+        default="rules/demo.json",
+        help="Path to rules JSON",
+    )
+    rules_profile.add_argument(
+        "-t",
+        "--target",
+        required=True,
+        help="File or directory to profile the rules against",
+    )
+    rules_profile.add_argument(
+        "--type",
+        choices=[
+            "terraform",
+            "cloudformation",
+            "kubernetes",
+            "docker_compose",
+            "arm",
+        ],
+        help="Force file type (useful for YAML/JSON)",
+    )
+    rules_profile.add_argument(
+        "--max-file-size",
+        type=_size_arg,
+        default=DEFAULT_MAX_FILE_SIZE,
+        metavar="SIZE",
+        help="Skip files larger than SIZE (bytes, or with K/M/G suffix)",
+    )
+    rules_profile.add_argument(
+        "-o",
+        "--output",
+        help="Profile path (default: next to the rules, as <rules>.profile.json)",
+    )
+    rules_profile.set_defaults(func=rules_profile_command)
+
     report = subparsers.add_parser(
         "report",
         help="Generate a client report from a JSON scan output",
@@ -231,7 +558,13 @@ def build_parser() -> argparse.ArgumentParser:
         "-o",
         "--output",
         required=True,
-        help="Path to write the report (Markdown)",
+        help="Path to write the report",
+    )
+    report.add_argument(
+        "--format",
+        choices=["markdown", "sarif"],
+        default="markdown",
+        help="Report format",
     )
     report.set_defaults(func=report_command)
 
@@ -241,6 +574,11 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
+    if getattr(args, "shard", None):
+        if args.format != "json":
+            parser.error("--shard requires --format json")
+        if args.terraform_project:
+            parser.error("--shard cannot be combined with --terraform-project")
     return args.func(args)
 
 
@@ -1,7 +1,11 @@
 """Deterministic rule engine for SIS."""
+import os
 import re
 import json
-from typing import Dict, List, Any, Optional
+import time
+import hashlib
+import warnings
+from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
 
 class RuleType(str, Enum):
@@ -20,16 +24,78 @@ class Operator(str, Enum):
     REGEX = "REGEX"
     GREATER_THAN = "GREATER_THAN"
 
+# Relative cost of evaluating each operator; only the ordering matters.
+OPERATOR_COST = {
+    Operator.EXISTS: 1.0,
+    Operator.EQUALS: 1.0,
+    Operator.CONTAINS: 2.0,
+    Operator.GREATER_THAN: 3.0,
+    Operator.REGEX: 10.0,
+}
+
+# Prior probability that a condition holds, used until a profile says otherwise.
+OPERATOR_SELECTIVITY = {
+    Operator.EXISTS: 0.5,
+    Operator.EQUALS: 0.2,
+    Operator.CONTAINS: 0.3,
+    Operator.GREATER_THAN: 0.5,
+    Operator.REGEX: 0.3,
+}
+
+# Weight of the prior, in evaluations, when blending it with profiled counts.
+PRIOR_WEIGHT = 10
+
+Outcome = Any  # bool, or the exception the condition raised
+
 class Condition:
     def __init__(self, path: str, operator: Operator, value: Any):
         self.path = path
         self.operator = operator
         self.value = value
+        self.parts = path.split('.')
+        # Identical conditions share this key, in the per-resource memo and
+        # in selectivity profiles.
+        self.key = json.dumps([path, operator.value, value], sort_keys=True, default=repr)
+        
+        self.pattern = None
+        if operator == Operator.REGEX:
+            try:
+                self.pattern = re.compile(value)
+            except (re.error, TypeError):
+                pass
+        
+        # Whether evaluation can raise for some resource. Reordering must not
+        # surface (or hide) an error that file-order evaluation would not.
+        self.may_raise = (
+            operator == Operator.GREATER_THAN
+            or (operator == Operator.REGEX and self.pattern is None)
+            or (operator == Operator.CONTAINS and not isinstance(value, str))
+        )
+    
+    def estimate(self, profile: Optional[Dict] = None, 
+                 ns_per_unit: Optional[float] = None) -> Tuple[float, float]:
+        """Return (cost, probability of holding) for ordering purposes."""
+        cost = OPERATOR_COST[self.operator]
+        selectivity = OPERATOR_SELECTIVITY[self.operator]
+        if ns_per_unit:
+            cost *= ns_per_unit
+        
+        entry = (profile or {}).get(self.key)
+        if entry and entry.get("evaluations"):
+            evaluations = entry["evaluations"]
+            selectivity = (
+                (entry.get("matches", 0) + selectivity * PRIOR_WEIGHT)
+                / (evaluations + PRIOR_WEIGHT)
+            )
+            if ns_per_unit and entry.get("mean_ns"):
+                cost = entry["mean_ns"]
+        
+        return cost, min(max(selectivity, 0.01), 0.99)
     
     def evaluate(self, resource: Dict) -> bool:
         """Evaluate condition against resource."""
         current = resource
-        parts = self.path.split('.')
+        parts = self.parts
         
         for part in parts[:-1]:
             if not isinstance(current, dict) or part not in current:
@@ -50,11 +116,26 @@ class Condition:
         elif self.operator == Operator.CONTAINS:
             return isinstance(target, str) and self.value in target
         elif self.operator == Operator.REGEX:
+            if self.pattern is not None:
+                return bool(self.pattern.match(str(target)))
             return bool(re.match(self.value, str(target)))
         elif self.operator == Operator.GREATER_THAN:
             return float(target) > float(self.value)
         return False
 
+def _check(condition: Condition, resource: Dict, memo: Dict[str, Outcome]) -> Outcome:
+    """Evaluate a condition once per resource, remembering errors as outcomes."""
+    try:
+        return memo[condition.key]
+    except KeyError:
+        pass
+    try:
+        outcome = bool(condition.evaluate(resource))
+    except Exception as exc:
+        outcome = exc
+    memo[condition.key] = outcome
+    return outcome
+
 class Rule:
     def __init__(self, rule_id: str, rule_type: RuleType, 
                  applies_to: Dict, detection: Dict, message: str):
@@ -71,6 +152,17 @@ class Rule:
             ) for cond in detection.get("conditions", [])
         ]
         self.message = message
+        self.order_conditions()
+    
+    @classmethod
+    def from_dict(cls, rule: Dict) -> "Rule":
+        return cls(
+            rule["rule_id"],
+            RuleType(rule["rule_type"]),
+            rule["applies_to"],
+            rule["detection"],
+            rule["message"]
+        )
     
     def matches_file_type(self, file_type: str) -> bool:
         return file_type in self.file_types
@@ -80,50 +172,215 @@ class Rule:
             return True
         return resource_kind in self.resource_kinds
     
-    def evaluate(self, resource: Dict) -> bool:
-        """Evaluate rule against resource."""
+    def order_conditions(self, profile: Optional[Dict] = None, 
+                         ns_per_unit: Optional[float] = None) -> None:
+        """Choose the order conditions are evaluated in.
+        
+        ALL rules try first the conditions most likely to fail per unit of
+        cost, ANY rules the ones most likely to hold.
+        """
+        def rank(index: int) -> Tuple[float, int]:
+            cost, selectivity = self.conditions[index].estimate(profile, ns_per_unit)
+            if self.match_logic == MatchLogic.ALL:
+                return cost / (1 - selectivity), index
+            return cost / selectivity, index
+        
+        self.order = sorted(range(len(self.conditions)), key=rank)
+        self.ordered = [self.conditions[index] for index in self.order]
+        self.may_raise = any(cond.may_raise for cond in self.conditions)
+    
+    def evaluate(self, resource: Dict, memo: Optional[Dict[str, Outcome]] = None) -> bool:
+        """Evaluate rule against resource.
+        
+        Conditions run in ``self.order``, but the result (including any
+        exception) is the one file-order all()/any() evaluation would give:
+        that is decided by the first condition, in file order, that is False
+        for ALL (True for ANY) or raises.
+        """
         if not self.conditions:
             return False
+        if memo is None:
+            memo = {}
+        
+        deciding = self.match_logic == MatchLogic.ANY
+        
+        if not self.may_raise:
+            # No condition can raise, so any deciding condition decides.
+            for condition in self.ordered:
+                outcome = memo.get(condition.key)
+                if outcome is None:
+                    outcome = _check(condition, resource, memo)
+                if outcome == deciding:
+                    return deciding
+            return not deciding
         
-        if self.match_logic == MatchLogic.ALL:
-            return all(cond.evaluate(resource) for cond in self.conditions)
-        else:
-            return any(cond.evaluate(resource) for cond in self.conditions)
+        decided = len(self.conditions)
+        error = None
+        
+        for index in self.order:
+            if index > decided:
+                continue
+            condition = self.conditions[index]
+            # Once a condition has decided the rule, an earlier one can only
+            # change the outcome by raising.
+            if decided < len(self.conditions) and error is None and not condition.may_raise:
+                continue
+            outcome = _check(condition, resource, memo)
+            if isinstance(outcome, Exception):
+                decided, error = index, outcome
+            elif outcome == deciding:
+                decided, error = index, None
+        
+        if error is not None:
+            # Conditions skipped above may come before the error in file order.
+            for index in range(decided):
+                if _check(self.conditions[index], resource, memo) == deciding:
+                    return deciding
+            raise error
+        if decided < len(self.conditions):
+            return deciding
+        return not deciding
+
+def _valid_profile_entry(entry: Any) -> bool:
+    return isinstance(entry, dict) and all(
+        isinstance(entry.get(field, 0), (int, float)) 
+        and not isinstance(entry.get(field, 0), bool)
+        for field in ("evaluations", "matches", "mean_ns")
+    )
+
+def profile_path(rules_file: str) -> str:
+    """Return the selectivity profile stored alongside a ruleset."""
+    return os.path.splitext(rules_file)[0] + ".profile.json"
 
 class RuleEngine:
-    def __init__(self, rules_file: str = "rules/canonical.json"):
-        self.rules = self._load_rules(rules_file)
+    def __init__(self, rules_file: str = "rules/canonical.json", 
+                 profile_file: Optional[str] = None):
+        self.rules_file = rules_file
+        self.profile_file = profile_file or profile_path(rules_file)
+        self.profiling = False
+        self.stats: Dict[str, List[float]] = {}
+        self._load()
+    
+    def reload(self) -> None:
+        """(Re)load rules from the rules file."""
+        self._load()
+    
+    def _load(self) -> None:
+        # Shared by __init__ and reload() so the profile warning's stacklevel
+        # points at their caller either way.
+        self.rules = self._load_rules(self.rules_file)
         self.rules_by_id = {r.rule_id: r for r in self.rules}
+        self.profile = self._load_profile(self.profile_file)
+        self.order_rules()
+    
+    def _load_profile(self, profile_file: str) -> Dict[str, Dict]:
+        # The profile only tunes evaluation order, so a bad one is ignored
+        # rather than stopping scans.
+        if not os.path.exists(profile_file):
+            return {}
+        try:
+            with open(profile_file, 'r', encoding='utf-8') as f:
+                conditions = json.load(f)["conditions"]
+            if not isinstance(conditions, dict) or not all(
+                _valid_profile_entry(entry) for entry in conditions.values()
+            ):
+                raise ValueError("unexpected profile structure")
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            warnings.warn(
+                f"Ignoring selectivity profile {profile_file}: {exc}",
+                RuntimeWarning,
+                stacklevel=4,
+            )
+            return {}
+        return conditions
+    
+    def order_rules(self) -> None:
+        """Order every rule's conditions using the static model and profile."""
+        ns_per_unit = None
+        ratios = sorted(
+            entry["mean_ns"] / OPERATOR_COST[condition.operator]
+            for rule in self.rules
+            for condition in rule.conditions
+            for entry in [self.profile.get(condition.key)]
+            if entry and entry.get("mean_ns")
+        )
+        if ratios:
+            # Calibrates static costs so unprofiled conditions compare with
+            # measured ones.
+            ns_per_unit = ratios[len(ratios) // 2]
+        
+        for rule in self.rules:
+            rule.order_conditions(self.profile, ns_per_unit)
+    
+    def _profile_resource(self, rules: List[Rule], resource: Dict, 
+                          memo: Dict[str, Outcome]) -> None:
+        # Every condition is evaluated (not just until the rule is decided)
+        # so the recorded match rates are not skewed by the current order.
+        for rule in rules:
+            for condition in rule.conditions:
+                if condition.key in memo:
+                    continue
+                start = time.perf_counter_ns()
+                outcome = _check(condition, resource, memo)
+                elapsed = time.perf_counter_ns() - start
+                stats = self.stats.setdefault(condition.key, [0, 0, 0])
+                stats[0] += 1
+                stats[1] += outcome is True
+                stats[2] += elapsed
+    
+    def save_profile(self, profile_file: Optional[str] = None) -> str:
+        """Write the counts gathered while profiling; returns the path."""
+        path = profile_file or self.profile_file
+        conditions = {
+            key: {
+                "evaluations": evaluations,
+                "matches": matches,
+                "mean_ns": round(total_ns / evaluations, 1),
+            }
+            for key, (evaluations, matches, total_ns) in sorted(self.stats.items())
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "ruleset_version": self.ruleset_version,
+                "fingerprint": self.fingerprint,
+                "conditions": conditions,
+            }, f, indent=2)
+        return path
     
     def _load_rules(self, rules_file: str) -> List[Rule]:
-        with open(rules_file, 'r') as f:
-            data = json.load(f)
-        
-        return [
-            Rule(
-                rule["rule_id"],
-                RuleType(rule["rule_type"]),
-                rule["applies_to"],
-                rule["detection"],
-                rule["message"]
-            ) for rule in data.get("rules", [])
-        ]
+        with open(rules_file, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        
+        self.ruleset_version = data.get("ruleset_version", "")
+        # Identifies the exact rule content, even if the version is not bumped.
+        self.fingerprint = hashlib.sha256(raw).hexdigest()
+        
+        return [Rule.from_dict(rule) for rule in data.get("rules", [])]
     
     def scan_resource(self, file_type: str, resource_kind: str, 
                      resource: Dict) -> List[Dict]:
         """Scan single resource for matching rules."""
         findings = []
+        # Conditions shared between rules are evaluated once per resource.
+        memo: Dict[str, Outcome] = {}
         
-        for rule in self.rules:
-            if (rule.matches_file_type(file_type) and 
-                rule.matches_resource_kind(resource_kind)):
-                if rule.evaluate(resource):
-                    findings.append({
-                        "rule_id": rule.rule_id,
-                        "rule_type": rule.rule_type.value,
-                        "message": rule.message,
-                        "resource_kind": resource_kind,
-                        "resource_name": resource.get("name", "")
-                    })
+        rules = [
+            rule for rule in self.rules
+            if rule.matches_file_type(file_type) 
+            and rule.matches_resource_kind(resource_kind)
+        ]
+        if self.profiling:
+            self._profile_resource(rules, resource, memo)
+        
+        for rule in rules:
+            if rule.evaluate(resource, memo):
+                findings.append({
+                    "rule_id": rule.rule_id,
+                    "rule_type": rule.rule_type.value,
+                    "message": rule.message,
+                    "resource_kind": resource_kind,
+                    "resource_name": resource.get("name", "")
+                })
         
         return findings
\ No newline at end of file
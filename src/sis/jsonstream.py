@@ -0,0 +1,231 @@
+"""Incremental reading of large JSON scan payloads."""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Container, Dict, Iterator, TextIO, Tuple
+
+
+CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n"
+_NUMBER_START = frozenset("-0123456789")
+_NUMBER_CHARS = frozenset("+-.eE0123456789")
+
+
+def _skip_pattern(levels: int) -> "re.Pattern[str]":
+    """Match a run of scalars, strings and complete nested values.
+
+    Used inside an array or object, a run stops at the container's closing
+    bracket. Values nested up to ``levels`` deep are consumed whole by one
+    C-level match; only brackets of deeper or incomplete values are left to
+    the caller. Possessive quantifiers keep failing matches linear, so a
+    value cut off by the end of the buffer stops the run at its opening
+    bracket or quote.
+    """
+    scalars = r'[^"\[\]{}]++|"(?:[^"\\]++|\\.)*+"'
+    item = scalars
+    for _ in range(levels):
+        item = scalars + r"|[\[{](?:" + item + r")*+[\]}]"
+    return re.compile("(?:" + item + ")*+")
+
+
+_SKIP_RUN = _skip_pattern(4)
+# Deletes every ASCII character but quotes and brackets. Anything else left
+# over is non-ASCII, which valid JSON only has inside strings.
+_STRUCTURE_ONLY = {code: None for code in range(128) if chr(code) not in '"[]{}'}
+_BRACKET_PAIR = re.compile(r'[\[{][\]}]')
+
+
+def _bracket_balance(text: str) -> Tuple[int, int]:
+    """Return (unmatched closing, unmatched opening) brackets in ``text``.
+
+    ``text`` must start outside a string and contain no escaped quotes, so
+    splitting on quotes separates strings from structure.
+    """
+    # Strings left without brackets collapse to adjacent quote pairs, which
+    # can be dropped without changing which quotes open and close strings.
+    structure = text.translate(_STRUCTURE_ONLY).replace('""', "")
+    brackets = "".join(structure.split('"')[::2])
+    removed = 1
+    while removed:
+        brackets, removed = _BRACKET_PAIR.subn("", brackets)
+    opens = len(brackets.lstrip("]}"))
+    return len(brackets) - opens, opens
+
+
+class _Reader:
+    """Character cursor over a text stream, decoding values with raw_decode."""
+
+    def __init__(self, handle: TextIO):
+        self.handle = handle
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer stays around one chunk in size.
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at end of input)."""
+        buffer, pos = self.buffer, self.pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+            buffer, pos = self.buffer, self.pos
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            buffer, pos = self.buffer, self.pos
+            # A number is only complete once a character that cannot extend it
+            # follows; a chunk may end part-way through "1.5" or "1e-07".
+            if pos < len(buffer) and buffer[pos] in _NUMBER_START:
+                end = pos + 1
+                while end < len(buffer) and buffer[end] in _NUMBER_CHARS:
+                    end += 1
+                if end == len(buffer) and self._fill():
+                    continue
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        """Skip one value without decoding it.
+
+        Arrays and objects are skipped by matching brackets outside strings;
+        their content is not validated. Scalars are decoded as usual.
+        """
+        first = self.peek()
+        if first not in ("[", "{"):
+            self.value()
+            return
+        depth = 1
+        pos = self.pos + 1
+        while True:
+            buffer = self.buffer
+            # Whole chunks inside the value are skipped by counting brackets
+            # outside strings; a string running into the next chunk is left
+            # for the next pass.
+            end = len(buffer)
+            if buffer.count('"', pos) % 2:
+                end = buffer.rindex('"', pos)
+            closes = depth
+            if buffer.find('\\"', pos, end + 1) < 0:
+                closes, opens = _bracket_balance(buffer[pos:end])
+            if closes < depth:
+                depth += opens - closes
+                pos = end
+            else:
+                # The value ends in this chunk (or escaped quotes make the
+                # split unreliable): walk it bracket by bracket.
+                while True:
+                    pos = _SKIP_RUN.match(buffer, pos).end()
+                    if pos == len(buffer) or buffer[pos] == '"':
+                        break
+                    depth += 1 if buffer[pos] in "[{" else -1
+                    pos += 1
+                    if depth == 0:
+                        self.pos = pos
+                        return
+            # Out of input, possibly part-way through a string: refill and
+            # carry on from the string's opening quote.
+            self.pos = pos
+            if not self._fill():
+                raise ValueError(f"Unexpected end of input at offset {self.pos}")
+            pos = self.pos
+
+
+def _iter_array(reader: _Reader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("]")
+        return
+
+
+class _AnyKey:
+    """Container matching every key except one (used to skip other members)."""
+
+    def __init__(self, excluded: str):
+        self.excluded = excluded
+
+    def __contains__(self, key: object) -> bool:
+        return key != self.excluded
+
+
+def iter_members(
+    handle: TextIO,
+    stream: Container[str] = (),
+    skip: Container[str] = (),
+) -> Iterator[Tuple[str, Any]]:
+    """Yield the top-level members of a JSON object without loading it whole.
+
+    Arrays under a key in ``stream`` are yielded one ``(key, element)`` pair at
+    a time; values under a key in ``skip`` are scanned past without being
+    decoded and not yielded. Every other member is yielded as a decoded
+    ``(key, value)``.
+    """
+    reader = _Reader(handle)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in stream and reader.peek() == "[":
+            for item in _iter_array(reader):
+                yield key, item
+        elif key in skip:
+            reader.skip()
+        else:
+            yield key, reader.value()
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("}")
+        return
+
+
+def iter_array_member(path: str, key: str) -> Iterator[Any]:
+    """Yield the elements of one top-level array in a JSON file."""
+    with open(path, "r", encoding="utf-8") as handle:
+        for member, item in iter_members(handle, stream={key}, skip=_AnyKey(key)):
+            if member == key:
+                yield item
+
+
+def read_members(path: str, skip: Container[str] = ()) -> Dict[str, Any]:
+    """Read the top-level members of a JSON file, skipping the given keys."""
+    with open(path, "r", encoding="utf-8") as handle:
+        return dict(iter_members(handle, skip=skip))
@@ -1,14 +1,29 @@
 """SIS FastAPI application."""
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+import json
+import os
 import uuid
 from datetime import datetime
-from typing import List
+from typing import Annotated, Any, BinaryIO, Dict, List, Optional, Tuple
+import threading
 import time
 from collections import defaultdict
 
-from sis.api.schemas import ScanRequest, ScanResponse, ErrorResponse
+from sis.api.cache import ScanCache
+from sis.api.archive import ArchiveError, ArchiveLimitError, iter_archive_members
+from sis.api.jobs import JobManager, JobStore, QueueFullError
+from sis.api.schemas import (
+    ErrorResponse,
+    JobResponse,
+    JobStatus,
+    JobSubmitResponse,
+    ScanRequest,
+    ScanResponse,
+)
+from sis.cli import _detect_type
 from sis.engine import RuleEngine
 from sis.parsers import parse_file
 
@@ -21,15 +36,101 @@ app = FastAPI(
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_methods=["POST"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
 # Rate limiting cache
 rate_limit_cache = defaultdict(list)
 
-# Rule engine (singleton)
-engine = RuleEngine()
+# Rule engine and result cache (singletons, built on first request so
+# importing this module stays cheap)
+_engine: Optional[RuleEngine] = None
+_cache: Optional[ScanCache] = None
+_jobs: Optional[JobManager] = None
+_singleton_lock = threading.Lock()
+_reload_lock = threading.Lock()
+# (mtime, size) of the rules file when the current engine was loaded
+_rules_stamp: Optional[Tuple[int, int]] = None
+
+def _stat_rules(rules_file: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(rules_file)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def get_engine() -> RuleEngine:
+    global _engine, _rules_stamp
+    if _engine is None:
+        with _singleton_lock:
+            if _engine is None:
+                rules_file = os.environ.get("SIS_RULES", "rules/demo.json")
+                _rules_stamp = _stat_rules(rules_file)
+                _engine = RuleEngine(rules_file)
+    return _engine
+
+def get_cache() -> ScanCache:
+    global _cache
+    if _cache is None:
+        engine = get_engine()
+        with _singleton_lock:
+            if _cache is None:
+                _cache = ScanCache(
+                    f"{engine.ruleset_version}:{engine.fingerprint}",
+                    max_entries=int(os.environ.get("SIS_CACHE_SIZE", "1024")),
+                    directory=os.environ.get("SIS_CACHE_DIR") or None
+                )
+    return _cache
+
+# Request limits
+MAX_FILE_SIZE = 1024 * 1024
+MAX_TOTAL_SIZE = 10 * 1024 * 1024
+MAX_ARCHIVE_MEMBERS = 1000
+# Compressed archive uploads: the inflated limit plus room for tar headers
+# and multipart framing.
+MAX_UPLOAD_SIZE = MAX_TOTAL_SIZE + 2 * 1024 * 1024
+
+class UploadSizeLimit:
+    """ASGI middleware rejecting request bodies over a byte cap with a 413.
+    
+    Content-Length is checked before the body is read, and the bytes are
+    counted as they arrive, so an oversized upload is refused while it is
+    still streaming instead of after it has been spooled.
+    """
+    
+    def __init__(self, app, paths: List[str], max_bytes: int):
+        self.app = app
+        self.paths = set(paths)
+        self.max_bytes = max_bytes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            if received == 0:
+                for name, value in scope.get("headers", []):
+                    if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                        raise HTTPException(status_code=413, detail="Upload too large")
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail="Upload too large")
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+app.add_middleware(
+    UploadSizeLimit,
+    paths=["/v1/scan/archive"],
+    max_bytes=MAX_UPLOAD_SIZE,
+)
 
 def check_rate_limit(api_key: str, max_per_hour: int = 100) -> bool:
     """Simple rate limiting."""
@@ -47,10 +148,8 @@ def check_rate_limit(api_key: str, max_per_hour: int = 100) -> bool:
     rate_limit_cache[api_key].append(now)
     return True
 
-@app.post("/v1/scan", response_model=ScanResponse)
-async def scan_files(request: ScanRequest, api_request: Request):
-    """Scan files for irreversible patterns."""
-    
+def authorize(api_request: Request) -> str:
+    """Enforce API key and rate limit for a request; return the API key."""
     api_key = api_request.headers.get("X-API-Key")
     if not api_key:
         raise HTTPException(status_code=401, detail="API key required")
@@ -62,44 +161,137 @@ async def scan_files(request: ScanRequest, api_request: Request):
             headers={"Retry-After": "3600"}
         )
     
-    total_size = sum(len(f.content) for f in request.files)
-    if total_size > 10 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="Payload too large")
+    return api_key
+
+def reload_rules(if_changed: bool = False) -> None:
+    """Reload the ruleset and drop cached results from the old one.
     
-    if len(request.files) > 100:
-        raise HTTPException(status_code=400, detail="Too many files")
+    A new engine is built and swapped in, so scans already running finish
+    with the rules they started with.
+    """
+    global _engine, _rules_stamp
+    rules_file = get_engine().rules_file
+    with _reload_lock:
+        stamp = _stat_rules(rules_file)
+        if if_changed and stamp == _rules_stamp:
+            return
+        engine = RuleEngine(rules_file)
+        _engine, _rules_stamp = engine, stamp
+        ruleset = f"{engine.ruleset_version}:{engine.fingerprint}"
+        if get_cache().ruleset != ruleset:
+            get_cache().invalidate(ruleset)
+
+def check_rules() -> None:
+    """Reload the ruleset if its file has changed since it was loaded."""
+    if _stat_rules(get_engine().rules_file) == _rules_stamp:
+        return
+    try:
+        reload_rules(if_changed=True)
+    except Exception:
+        # A half-written or broken rules file: keep serving the loaded
+        # rules and try again on the next scan.
+        pass
+
+def _scan_uncached(
+    file_type: str, content: str
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    findings = []
+    errors = []
+    engine = get_engine()
     
+    try:
+        resources = parse_file(file_type, content)
+        
+        for resource in resources:
+            resource_findings = engine.scan_resource(
+                file_type=file_type,
+                resource_kind=resource.get("kind", ""),
+                resource=resource
+            )
+            
+            for finding in resource_findings:
+                finding.update({
+                    "file": "",
+                    "line": resource.get("line", 1)
+                })
+            
+            findings.extend(resource_findings)
+            
+    except Exception as e:
+        errors.append({
+            "file": "",
+            "error": "PARSE_ERROR",
+            "message": str(e)
+        })
+    
+    return findings, errors
+
+def scan_content(
+    name: str, file_type: str, content: str
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parse and evaluate a single file's content, using the result cache."""
+    check_rules()
+    cache = get_cache()
+    key = cache.key(file_type, content)
+    cached = cache.get(key)
+    if cached is None:
+        cached = _scan_uncached(file_type, content)
+        cache.put(key, cached)
+    
+    findings, errors = cached
+    return (
+        [dict(finding, file=name) for finding in findings],
+        [dict(error, file=name) for error in errors]
+    )
+
+def scan_archive(
+    fileobj: BinaryIO,
+) -> Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Scan every recognised member of a tar(.gz) or zip archive.
+    
+    Members are read one at a time and scanned as they arrive; unknown file
+    types are skipped. Runs synchronously, so call it off the event loop.
+    """
+    total_files = 0
     all_findings = []
     errors = []
     
-    for file in request.files:
+    members = iter_archive_members(
+        fileobj,
+        max_members=MAX_ARCHIVE_MEMBERS,
+        max_member_size=MAX_FILE_SIZE,
+        max_total_size=MAX_TOTAL_SIZE,
+    )
+    for name, data in members:
+        total_files += 1
+        file_type = _detect_type(name, None)
+        if not file_type:
+            continue
+        
         try:
-            resources = parse_file(file.type, file.content)
-            
-            for resource in resources:
-                findings = engine.scan_resource(
-                    file_type=file.type,
-                    resource_kind=resource.get("kind", ""),
-                    resource=resource
-                )
-                
-                for finding in findings:
-                    finding.update({
-                        "file": file.name,
-                        "line": resource.get("line", 1)
-                    })
-                
-                all_findings.extend(findings)
-                
-        except Exception as e:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError as e:
             errors.append({
-                "file": file.name,
-                "error": "PARSE_ERROR",
+                "file": name,
+                "error": "DECODE_ERROR",
                 "message": str(e)
             })
+            continue
+        
+        findings, file_errors = scan_content(name, file_type, content)
+        all_findings.extend(findings)
+        errors.extend(file_errors)
     
+    return total_files, all_findings, errors
+
+def build_response(
+    scan_id: str,
+    total_files: int,
+    all_findings: List[Dict[str, Any]],
+    errors: List[Dict[str, Any]],
+) -> ScanResponse:
     summary = {
-        "total_files": len(request.files),
+        "total_files": total_files,
         "total_findings": len(all_findings),
         "by_type": {
             "IRREVERSIBLE_IDENTITY_BINDING": 0,
@@ -112,7 +304,7 @@ async def scan_files(request: ScanRequest, api_request: Request):
         summary["by_type"][finding["rule_type"]] += 1
     
     return ScanResponse(
-        scan_id=request.scan_id or str(uuid.uuid4()),
+        scan_id=scan_id,
         timestamp=datetime.utcnow().isoformat() + "Z",
         scanner_version="1.0.0",
         findings=all_findings,
@@ -120,12 +312,161 @@ async def scan_files(request: ScanRequest, api_request: Request):
         errors=errors
     )
 
+# Background scan jobs
+def get_jobs() -> JobManager:
+    global _jobs
+    if _jobs is None:
+        with _singleton_lock:
+            if _jobs is None:
+                _jobs = JobManager(
+                    scan_content,
+                    JobStore(
+                        os.environ.get("SIS_JOBS_DB", ":memory:"),
+                        ttl=float(os.environ.get("SIS_JOB_TTL", "3600"))
+                    ),
+                    workers=int(os.environ.get("SIS_JOB_WORKERS", "2"))
+                )
+    return _jobs
+
+def validate_request(request: ScanRequest) -> None:
+    total_size = sum(len(f.content) for f in request.files)
+    if total_size > MAX_TOTAL_SIZE:
+        raise HTTPException(status_code=413, detail="Payload too large")
+    
+    if len(request.files) > 100:
+        raise HTTPException(status_code=400, detail="Too many files")
+
+@app.post("/v1/scan", response_model=ScanResponse)
+async def scan_files(request: ScanRequest, api_request: Request):
+    """Scan files for irreversible patterns."""
+    
+    authorize(api_request)
+    validate_request(request)
+    
+    all_findings = []
+    errors = []
+    
+    for file in request.files:
+        findings, file_errors = scan_content(file.name, file.type.value, file.content)
+        all_findings.extend(findings)
+        errors.extend(file_errors)
+    
+    return build_response(
+        request.scan_id or str(uuid.uuid4()),
+        len(request.files),
+        all_findings,
+        errors
+    )
+
+@app.post("/v1/scan/archive", response_model=ScanResponse)
+async def scan_archive_upload(api_request: Request, file: Annotated[UploadFile, File()]):
+    """Scan a tar.gz or zip archive uploaded as multipart form data."""
+    
+    authorize(api_request)
+    
+    try:
+        total_files, all_findings, errors = await run_in_threadpool(
+            scan_archive, file.file
+        )
+    except ArchiveLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e)) from e
+    except ArchiveError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    finally:
+        await file.close()
+    
+    return build_response(str(uuid.uuid4()), total_files, all_findings, errors)
+
+# The job handlers are plain functions so FastAPI runs them in its threadpool:
+# the store's SQLite calls block, and wait on workers committing results.
+@app.post("/v1/scans", response_model=JobSubmitResponse, status_code=202)
+def submit_scan_job(request: ScanRequest, api_request: Request):
+    """Queue a scan job and return its id without waiting for results."""
+    
+    api_key = authorize(api_request)
+    validate_request(request)
+    
+    scan_id = request.scan_id or str(uuid.uuid4())
+    files = [(f.name, f.type.value, f.content) for f in request.files]
+    try:
+        job_id = get_jobs().submit(api_key, scan_id, files)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": "60"}
+        ) from e
+    
+    return JobSubmitResponse(job_id=job_id, scan_id=scan_id, status=JobStatus.QUEUED)
+
+def get_job(job_id: str, api_request: Request) -> dict:
+    api_key = api_request.headers.get("X-API-Key")
+    if not api_key:
+        raise HTTPException(status_code=401, detail="API key required")
+    
+    get_jobs().purge_expired()
+    job = get_jobs().store.get(job_id)
+    if job is None or job["api_key"] != api_key:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/v1/scans/{job_id}", response_model=JobResponse)
+def get_scan_job(
+    job_id: str,
+    api_request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Return job status, progress and a page of findings."""
+    
+    job = get_job(job_id, api_request)
+    findings = get_jobs().store.results(job_id, "finding", offset, limit)
+    total_findings = get_jobs().store.count_results(job_id, "finding")
+    next_offset = offset + limit if offset + limit < total_findings else None
+    
+    return JobResponse(
+        job_id=job_id,
+        scan_id=job["scan_id"],
+        status=job["status"],
+        progress={
+            "files_done": job["files_done"],
+            "files_total": job["files_total"]
+        },
+        summary=job["summary"],
+        findings=findings,
+        errors=get_jobs().store.results(job_id, "error"),
+        offset=offset,
+        next_offset=next_offset
+    )
+
+@app.get("/v1/scans/{job_id}/results")
+def stream_scan_job_results(job_id: str, api_request: Request):
+    """Stream all findings and errors recorded so far as NDJSON."""
+    
+    get_job(job_id, api_request)
+    
+    # A sync generator: StreamingResponse iterates it in the threadpool.
+    def lines():
+        for kind in ("finding", "error"):
+            for item in get_jobs().store.iter_results(job_id, kind):
+                yield json.dumps({"kind": kind, "data": item}) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/v1/cache/stats")
+async def cache_stats(api_request: Request):
+    """Report result cache size and hit/miss counters."""
+    
+    if not api_request.headers.get("X-API-Key"):
+        raise HTTPException(status_code=401, detail="API key required")
+    return get_cache().stats()
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
         content=ErrorResponse(
-            error=exc.status_code,
+            error=str(exc.status_code),
             message=exc.detail
         ).dict()
     )
@@ -1,27 +1,47 @@
-"""Parsers for supported IaC formats."""
-from typing import List, Dict, Any
+"""Parsers for supported IaC formats.
 
-from .terraform import parse_terraform
-from .cloudformation import parse_cloudformation
-from .kubernetes import parse_kubernetes
-from .docker_compose import parse_docker_compose
-from .arm import parse_arm
+Parser backends (PyYAML, python-hcl2 and its lark grammar) are imported on
+first use per file type, so importing this package stays cheap.
+"""
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+PARSERS: Dict[str, Tuple[str, str]] = {
+    "terraform": (".terraform", "parse_terraform"),
+    "cloudformation": (".cloudformation", "parse_cloudformation"),
+    "kubernetes": (".kubernetes", "parse_kubernetes"),
+    "docker_compose": (".docker_compose", "parse_docker_compose"),
+    "arm": (".arm", "parse_arm"),
+}
+
+_loaded: Dict[str, Callable[[str], List[Dict[str, Any]]]] = {}
+
+
+def get_parser(file_type: str) -> Callable[[str], List[Dict[str, Any]]]:
+    """Return the parser for a file type, importing its module on first use."""
+    parser = _loaded.get(file_type)
+    if parser is None:
+        if file_type not in PARSERS:
+            raise ValueError(f"Unsupported file type: {file_type}")
+        module_name, func_name = PARSERS[file_type]
+        parser = getattr(import_module(module_name, __name__), func_name)
+        _loaded[file_type] = parser
+    return parser
 
 
 def parse_file(file_type: str, content: str) -> List[Dict[str, Any]]:
     """Dispatch to the correct parser based on file type."""
-    if file_type == "terraform":
-        return parse_terraform(content)
-    if file_type == "cloudformation":
-        return parse_cloudformation(content)
-    if file_type == "kubernetes":
-        return parse_kubernetes(content)
-    if file_type == "docker_compose":
-        return parse_docker_compose(content)
-    if file_type == "arm":
-        return parse_arm(content)
+    return get_parser(file_type)(content)
+
 
-    raise ValueError(f"Unsupported file type: {file_type}")
+def __getattr__(name: str) -> Any:
+    # Keep `from sis.parsers import parse_terraform` working without eager
+    # imports.
+    for file_type, (_, func_name) in PARSERS.items():
+        if func_name == name:
+            return get_parser(file_type)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-__all__ = ["parse_file"]
+__all__ = ["parse_file", "get_parser"]
@@ -1,9 +1,77 @@
 """Azure ARM template parser for SIS."""
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
 import json
 
 
+# ARM templates declare their schema near the top; checking a prefix is far
+# cheaper than decoding JSON files (package.json, tsconfig.json, ...) that
+# only reach this parser because of their extension.
+SNIFF_BYTES = 4096
+
+
+def _looks_like_arm(content: str) -> bool:
+    head = content[:SNIFF_BYTES]
+    if "deploymentTemplate.json" in head:
+        return True
+    return '"resources"' in content and '"contentVersion"' in content
+
+
+def sniff_arm_bytes(data: Any) -> bool:
+    """Byte-level version of the ARM sniff for bytes or mmap buffers."""
+    if data.find(b"deploymentTemplate.json", 0, SNIFF_BYTES) != -1:
+        return True
+    return data.find(b'"resources"') != -1 and data.find(b'"contentVersion"') != -1
+
+
+def _qualify(
+    parent_type: str, parent_name: str, child_type: str, child_name: str
+) -> Tuple[str, str]:
+    # Nested children may use a short type ("databases") and name relative to
+    # the parent; fully qualified children already carry the full path.
+    if not parent_type or "/" in child_type:
+        return child_type, child_name
+    if child_name.startswith("["):
+        return f"{parent_type}/{child_type}", child_name
+    return f"{parent_type}/{child_type}", f"{parent_name}/{child_name}"
+
+
+def _iter_resources(
+    resources: Any, parent_type: str = "", parent_name: str = ""
+) -> Iterator[Dict[str, Any]]:
+    if not isinstance(resources, list):
+        return
+
+    for resource in resources:
+        if not isinstance(resource, dict):
+            continue
+        kind, name = _qualify(
+            parent_type,
+            parent_name,
+            str(resource.get("type", "")),
+            str(resource.get("name", "")),
+        )
+
+        entry = {key: val for key, val in resource.items() if key != "resources"}
+        # "kind" is the engine's resource kind; keep ARM's own "kind"
+        # property (e.g. StorageV2) under a separate key.
+        if "kind" in entry:
+            entry["arm_kind"] = entry.pop("kind")
+        entry["kind"] = kind
+        entry["type"] = kind
+        entry["name"] = name
+        # A copy loop is reported once, with its copy block intact.
+        yield entry
+
+        yield from _iter_resources(resource.get("resources"), kind, name)
+
+
 def parse_arm(content: str) -> List[Dict[str, Any]]:
-    """Parse ARM JSON template into resource list (demo stub)."""
-    _ = json.loads(content) if content.strip() else {}
-    return []
+    """Parse ARM JSON template into resource list, including child resources."""
+    if not content.strip() or not _looks_like_arm(content):
+        return []
+
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        return []
+
+    return list(_iter_resources(data.get("resources")))
@@ -3,7 +3,35 @@ from typing import List, Dict, Any
 import yaml
 
 
+# Use the libyaml-backed loader when PyYAML was built with it.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SECTIONS = {
+    "services": "service",
+    "volumes": "volume",
+    "networks": "network",
+}
+
+
 def parse_docker_compose(content: str) -> List[Dict[str, Any]]:
-    """Parse Docker Compose YAML into service resources (demo stub)."""
-    _ = yaml.safe_load(content) or {}
-    return []
+    """Parse Docker Compose YAML into service, volume and network resources."""
+    data = yaml.load(content, Loader=SafeLoader) or {}
+    resources: List[Dict[str, Any]] = []
+    if not isinstance(data, dict):
+        return resources
+
+    for section, kind in SECTIONS.items():
+        definitions = data.get(section) or {}
+        if not isinstance(definitions, dict):
+            continue
+        for name, attrs in definitions.items():
+            # Top-level volumes/networks are often declared with no body.
+            if attrs is None:
+                attrs = {}
+            if not isinstance(attrs, dict):
+                continue
+            entry = {"kind": kind, "name": str(name)}
+            entry.update(attrs)
+            resources.append(entry)
+
+    return resources
@@ -1,5 +1,5 @@
 """Terraform parser for SIS."""
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import io
 import json
 import hcl2
@@ -46,9 +46,7 @@ ALLOWED_KINDS = {
 }
 
 
-def parse_terraform(content: str) -> List[Dict[str, Any]]:
-    """Parse Terraform HCL/JSON into resource list (demo scope)."""
-    data = _load_terraform(content)
+def _extract_resources(data: Dict[str, Any]) -> List[Dict[str, Any]]:
     resources: List[Dict[str, Any]] = []
 
     for block in _iter_resource_blocks(data.get("resource", {})):
@@ -65,3 +63,32 @@ def parse_terraform(content: str) -> List[Dict[str, Any]]:
                 resources.append(resource)
 
     return resources
+
+
+def _extract_module_calls(data: Dict[str, Any]) -> List[Dict[str, str]]:
+    calls: List[Dict[str, str]] = []
+
+    for block in _iter_resource_blocks(data.get("module", {})):
+        for name, attrs in block.items():
+            if isinstance(attrs, list) and len(attrs) == 1:
+                attrs = attrs[0]
+            if not isinstance(attrs, dict):
+                continue
+            source = attrs.get("source")
+            if isinstance(source, str):
+                calls.append({"name": name, "source": source})
+
+    return calls
+
+
+def parse_terraform(content: str) -> List[Dict[str, Any]]:
+    """Parse Terraform HCL/JSON into resource list (demo scope)."""
+    return _extract_resources(_load_terraform(content))
+
+
+def parse_terraform_module(
+    content: str,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    """Parse Terraform HCL/JSON into resources and module calls (name, source)."""
+    data = _load_terraform(content)
+    return _extract_resources(data), _extract_module_calls(data)
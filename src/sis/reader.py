@@ -0,0 +1,56 @@
+"""Size-aware source file reading for SIS."""
+from __future__ import annotations
+
+import mmap
+import os
+
+from sis.parsers.arm import sniff_arm_bytes
+
+
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+# ARM candidates at least this large are memory-mapped so non-template JSON
+# can be rejected without copying the file into Python memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a file exceeds the configured size limit."""
+
+    def __init__(self, path: str, size: int, limit: int):
+        super().__init__(f"File is {size} bytes; limit is {limit} bytes")
+        self.path = path
+        self.size = size
+        self.limit = limit
+
+
+def _decode(data) -> str:
+    text = str(data, "utf-8")
+    # Match text-mode reads, which translate all newline styles to "\n".
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_source(
+    path: str, file_type: str, max_size: int = DEFAULT_MAX_FILE_SIZE
+) -> str:
+    """Read a file for parsing, enforcing the size limit before any read.
+
+    Returns an empty string for large JSON files that cannot be ARM templates;
+    the ARM parser yields no resources for those either way.
+    """
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size > max_size:
+            raise FileTooLargeError(path, size, max_size)
+
+        if file_type == "arm" and size >= MMAP_THRESHOLD:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if not sniff_arm_bytes(view):
+                    return ""
+                # Decodes straight from the mapping, skipping a bytes copy.
+                return _decode(view)
+
+        # One sized read and a single decode, instead of text-mode chunking.
+        return _decode(handle.read())
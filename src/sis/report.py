@@ -1,9 +1,19 @@
-"""Report generation for SIS."""
+"""Report generation for SIS.
+
+Renderers are generators over findings and errors, so reports can be written
+row by row while findings are streamed from disk.
+"""
 from __future__ import annotations
 
-from typing import Dict, Any, List
+import json
+from typing import Dict, Any, Iterable, Iterator, TextIO
 from datetime import datetime
 
+from sis import __version__
+
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
 
 def _safe(value: Any) -> str:
     if value is None:
@@ -11,80 +21,183 @@ def _safe(value: Any) -> str:
     return str(value)
 
 
-def _render_summary(summary: Dict[str, Any]) -> List[str]:
-    lines = ["## Summary", ""]
-    lines.append(f"Total findings: **{summary.get('total_findings', 0)}**")
-    lines.append("")
-    lines.append("By type:")
-    lines.append("")
-    lines.append("| Rule type | Count |")
-    lines.append("| --- | ---: |")
+def _render_context(payload: Dict[str, Any]) -> Iterator[str]:
+    yield "# SIS Scan Report"
+    yield ""
+    yield f"Generated: {datetime.utcnow().isoformat()}Z"
+    yield ""
+    yield "## Scan Context"
+    yield ""
+    yield f"- Target: `{payload.get('target', '')}`"
+    yield f"- Rules: `{payload.get('rules', '')}`"
+    if payload.get("total_files") is not None:
+        yield f"- Total files: `{payload.get('total_files')}`"
+    yield ""
+
+
+def _render_summary(summary: Dict[str, Any]) -> Iterator[str]:
+    yield "## Summary"
+    yield ""
+    yield f"Total findings: **{summary.get('total_findings', 0)}**"
+    yield ""
+    yield "By type:"
+    yield ""
+    yield "| Rule type | Count |"
+    yield "| --- | ---: |"
     for rule_type, count in (summary.get("by_type", {}) or {}).items():
-        lines.append(f"| {rule_type} | {count} |")
-    lines.append("")
-    return lines
-
+        yield f"| {rule_type} | {count} |"
+    yield ""
 
-def _render_findings(findings: List[Dict[str, Any]]) -> List[str]:
-    lines = ["## Findings", ""]
-    if not findings:
-        lines.append("No findings detected.")
-        lines.append("")
-        return lines
 
-    lines.append("| File | Line | Rule | Type | Message | Resource |")
-    lines.append("| --- | ---: | --- | --- | --- | --- |")
+def _render_findings(findings: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    yield "## Findings"
+    yield ""
+    empty = True
     for finding in findings:
+        if empty:
+            yield "| File | Line | Rule | Type | Message | Resource |"
+            yield "| --- | ---: | --- | --- | --- | --- |"
+            empty = False
         file_path = _safe(finding.get("file"))
         line = _safe(finding.get("line"))
         rule_id = _safe(finding.get("rule_id"))
         rule_type = _safe(finding.get("rule_type"))
         message = _safe(finding.get("message")).replace("|", "\\|")
         resource = f"{_safe(finding.get('resource_kind'))}:{_safe(finding.get('resource_name'))}"
-        lines.append(f"| {file_path} | {line} | {rule_id} | {rule_type} | {message} | {resource} |")
-    lines.append("")
-    return lines
-
+        yield f"| {file_path} | {line} | {rule_id} | {rule_type} | {message} | {resource} |"
+    if empty:
+        yield "No findings detected."
+    yield ""
 
-def _render_errors(errors: List[Dict[str, Any]]) -> List[str]:
-    lines = ["## Errors", ""]
-    if not errors:
-        lines.append("No errors reported.")
-        lines.append("")
-        return lines
 
-    lines.append("| File | Error | Message |")
-    lines.append("| --- | --- | --- |")
+def _render_errors(errors: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    yield "## Errors"
+    yield ""
+    empty = True
     for error in errors:
+        if empty:
+            yield "| File | Error | Message |"
+            yield "| --- | --- | --- |"
+            empty = False
         file_path = _safe(error.get("file"))
         code = _safe(error.get("error"))
         message = _safe(error.get("message")).replace("|", "\\|")
-        lines.append(f"| {file_path} | {code} | {message} |")
-    lines.append("")
-    return lines
+        yield f"| {file_path} | {code} | {message} |"
+    if empty:
+        yield "No errors reported."
+    yield ""
+
+
+def iter_markdown_report(
+    context: Dict[str, Any],
+    findings: Iterable[Dict[str, Any]],
+    errors: Iterable[Dict[str, Any]],
+) -> Iterator[str]:
+    """Yield Markdown report lines.
+
+    ``context`` holds target, rules, total_files and summary; findings and
+    errors may be any iterables and are consumed once, in order.
+    """
+    yield from _render_context(context)
+    yield from _render_summary(context.get("summary", {}) or {})
+    yield from _render_findings(findings)
+    # The last section ends with a blank line; drop it to end on content.
+    lines = _render_errors(errors)
+    previous = next(lines)
+    for line in lines:
+        yield previous
+        previous = line
+
+
+def write_markdown_report(
+    handle: TextIO,
+    context: Dict[str, Any],
+    findings: Iterable[Dict[str, Any]],
+    errors: Iterable[Dict[str, Any]],
+) -> None:
+    """Write a Markdown report line by line."""
+    for line in iter_markdown_report(context, findings, errors):
+        handle.write(line)
+        handle.write("\n")
 
 
 def render_markdown_report(payload: Dict[str, Any]) -> str:
     """Render a Markdown report from a JSON scan payload."""
-    lines: List[str] = []
-    lines.append("# SIS Scan Report")
-    lines.append("")
-    lines.append(f"Generated: {datetime.utcnow().isoformat()}Z")
-    lines.append("")
-    lines.append("## Scan Context")
-    lines.append("")
-    lines.append(f"- Target: `{payload.get('target', '')}`")
-    lines.append(f"- Rules: `{payload.get('rules', '')}`")
-    if payload.get("total_files") is not None:
-        lines.append(f"- Total files: `{payload.get('total_files')}`")
-    lines.append("")
-
-    summary = payload.get("summary", {}) or {}
-    findings = payload.get("findings", []) or []
-    errors = payload.get("errors", []) or []
-
-    lines.extend(_render_summary(summary))
-    lines.extend(_render_findings(findings))
-    lines.extend(_render_errors(errors))
-
-    return "\n".join(lines).strip() + "\n"
+    lines = iter_markdown_report(
+        payload,
+        payload.get("findings", []) or [],
+        payload.get("errors", []) or [],
+    )
+    return "\n".join(lines) + "\n"
+
+
+def _sarif_location(path: str, line: Any = None) -> Dict[str, Any]:
+    physical: Dict[str, Any] = {
+        "artifactLocation": {"uri": path.replace("\\", "/")},
+    }
+    if line is not None:
+        physical["region"] = {"startLine": max(int(line), 1)}
+    return {"physicalLocation": physical}
+
+
+def write_sarif_report(
+    handle: TextIO,
+    findings: Iterable[Dict[str, Any]],
+    errors: Iterable[Dict[str, Any]],
+) -> None:
+    """Write a SARIF 2.1.0 log, one result at a time.
+
+    The run's ``results`` are emitted before ``tool`` (member order is not
+    significant in SARIF) so rule descriptors can be collected on the way
+    without holding findings in memory.
+    """
+    rules: Dict[str, Dict[str, Any]] = {}
+
+    handle.write('{"$schema": ' + json.dumps(SARIF_SCHEMA))
+    handle.write(', "version": "2.1.0", "runs": [{"results": [')
+    for index, finding in enumerate(findings):
+        rule_id = _safe(finding.get("rule_id"))
+        if rule_id not in rules:
+            rules[rule_id] = {
+                "id": rule_id,
+                "shortDescription": {"text": _safe(finding.get("message"))},
+                "properties": {"rule_type": _safe(finding.get("rule_type"))},
+            }
+        result = {
+            "ruleId": rule_id,
+            "level": "warning",
+            "message": {"text": _safe(finding.get("message"))},
+            "locations": [
+                _sarif_location(_safe(finding.get("file")), finding.get("line", 1))
+            ],
+            "properties": {
+                "rule_type": _safe(finding.get("rule_type")),
+                "resource_kind": _safe(finding.get("resource_kind")),
+                "resource_name": _safe(finding.get("resource_name")),
+            },
+        }
+        handle.write(("," if index else "") + "\n" + json.dumps(result))
+
+    tool = {
+        "driver": {
+            "name": "SIS",
+            "fullName": "Static Irreversibility Scanner",
+            "version": __version__,
+            "rules": list(rules.values()),
+        }
+    }
+    handle.write('\n], "tool": ' + json.dumps(tool))
+    handle.write(', "invocations": [{"toolExecutionNotifications": [')
+    error_count = 0
+    for error in errors:
+        notification = {
+            "level": "error",
+            "descriptor": {"id": _safe(error.get("error"))},
+            "message": {"text": _safe(error.get("message"))},
+            "locations": [_sarif_location(_safe(error.get("file")))],
+        }
+        handle.write(("," if error_count else "") + "\n" + json.dumps(notification))
+        error_count += 1
+    handle.write(
+        '\n], "executionSuccessful": ' + json.dumps(error_count == 0) + "}]}]}\n"
+    )
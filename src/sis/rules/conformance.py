@@ -0,0 +1,377 @@
+"""Rule conformance testing for SIS.
+
+Rules may carry fixture resources under a ``tests`` key, which the engine
+ignores when scanning:
+
+    "tests": {
+      "positive": [{"account_id": "svc@proj.iam.gserviceaccount.com"}],
+      "negative": [{"account_id": "svc@example.com"}]
+    }
+
+Each rule is checked against its fixtures, timed, and its REGEX conditions
+are probed for catastrophic backtracking. Results are cached by a hash of
+the rule definition so unchanged rules are not re-run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sis import __version__
+from sis.engine import Operator, Rule
+
+
+CONFORMANCE_VERSION = "2"
+DEFAULT_CACHE = ".sis-rules-cache.json"
+
+# Backtracking probe: inputs double in size; linear matching roughly doubles
+# the time per step, quadratic quadruples it. A pattern is superlinear when
+# the time grows by more than SUPERLINEAR_RATIO per doubling across the whole
+# range; single steps are too noisy to judge. Timings are thread CPU time, the
+# best of PROBE_REPEATS runs that each last at least PROBE_MIN_SECONDS, so
+# they are unaffected by other processes competing for the CPU.
+PROBE_SIZES = (256, 512, 1024, 2048)
+PROBE_REPEATS = 3
+PROBE_MIN_SECONDS = 0.001
+SUPERLINEAR_RATIO = 3.0
+
+# Matching that uses more than PROBE_TIMEOUT seconds of CPU time in the probe
+# child is treated as exponential. CPU time excludes interpreter start-up and
+# time spent waiting for a core on a loaded machine; PROBE_WALL_TIMEOUT is
+# only a backstop for platforms without CPU timers.
+PROBE_TIMEOUT = 2.0
+PROBE_WALL_TIMEOUT = 60.0
+
+_CLASS_SAMPLES = {"d": "0", "w": "a", "s": " ", "D": "a", "W": "-", "S": "a"}
+_METACHARS = set("^$*+?{}[]()|")
+
+
+def _load_json_file(path: str) -> Optional[Any]:
+    with open(path, "r", encoding="utf-8") as handle:
+        content = handle.read()
+    if not content.strip():
+        return None
+    return json.loads(content)
+
+
+def _iter_json_files(path: str) -> Iterable[str]:
+    if os.path.isfile(path):
+        yield path
+        return
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            # Selectivity profiles written by `sis rules profile` sit next
+            # to rulesets but are not rules.
+            if name.endswith(".json") and not name.endswith(".profile.json"):
+                yield os.path.join(root, name)
+
+
+def load_rule_definitions(
+    paths: Iterable[str],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Load rule dicts from rulesets, single-rule vectors or directories.
+
+    Returns (rules, errors); each rule dict gains a ``source`` key. Empty
+    files are skipped.
+    """
+    rules: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+
+    for path in paths:
+        for file_path in _iter_json_files(path):
+            try:
+                data = _load_json_file(file_path)
+            except (OSError, ValueError) as exc:
+                errors.append({"file": file_path, "error": "LOAD_ERROR", "message": str(exc)})
+                continue
+            if data is None:
+                continue
+            if not isinstance(data, dict):
+                errors.append({
+                    "file": file_path,
+                    "error": "LOAD_ERROR",
+                    "message": "expected a ruleset or rule object",
+                })
+                continue
+            definitions = data.get("rules", []) if "rules" in data else [data]
+            if not isinstance(definitions, list):
+                definitions = [definitions]
+            for index, rule in enumerate(definitions):
+                if not isinstance(rule, dict):
+                    errors.append({
+                        "file": file_path,
+                        "error": "LOAD_ERROR",
+                        "message": f"rule {index + 1} is not an object",
+                    })
+                    continue
+                rules.append(dict(rule, source=file_path))
+
+    return rules, errors
+
+
+def rule_hash(rule: Dict[str, Any]) -> str:
+    """Hash a rule definition (including its fixtures) for result caching."""
+    body = {key: val for key, val in rule.items() if key != "source"}
+    digest = hashlib.sha256()
+    digest.update(f"{CONFORMANCE_VERSION}\0{__version__}\0".encode("utf-8"))
+    digest.update(json.dumps(body, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _pattern_chars(pattern: str) -> List[str]:
+    chars: List[str] = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\" and index + 1 < len(pattern):
+            escaped = pattern[index + 1]
+            chars.append(_CLASS_SAMPLES.get(escaped, escaped))
+            index += 2
+            continue
+        if char == ".":
+            chars.append("a")
+        elif char not in _METACHARS:
+            chars.append(char)
+        index += 1
+
+    unique = list(dict.fromkeys(chars + ["a"]))
+    return unique[:6]
+
+
+def adversarial_inputs(pattern: str, size: int) -> List[str]:
+    """Generate near-miss inputs built from the pattern's own characters.
+
+    Long runs of characters the pattern can consume, followed by a suffix it
+    cannot, are what drive backtracking regex engines into blowup.
+    """
+    chars = _pattern_chars(pattern)
+    suffix = "\x00\n"
+    inputs = [char * size + suffix for char in chars]
+    for first in chars[:3]:
+        for second in chars[:3]:
+            if first != second:
+                inputs.append((first + second) * (size // 2) + suffix)
+    return inputs
+
+
+def _time_match(compiled: Any, text: str) -> float:
+    loops = 1
+    while True:
+        start = time.thread_time()
+        for _ in range(loops):
+            compiled.match(text)
+        elapsed = time.thread_time() - start
+        if elapsed >= PROBE_MIN_SECONDS:
+            break
+        loops *= 10
+    best = elapsed / loops
+    for _ in range(PROBE_REPEATS - 1):
+        start = time.thread_time()
+        for _ in range(loops):
+            compiled.match(text)
+        best = min(best, (time.thread_time() - start) / loops)
+    return best
+
+
+def probe_regex(pattern: str) -> Iterator[Tuple[int, float]]:
+    """Yield (size, seconds) for the slowest input at each probe size."""
+    import re
+
+    compiled = re.compile(pattern)
+    for size in PROBE_SIZES:
+        inputs = adversarial_inputs(pattern, size)
+        yield size, max(_time_match(compiled, text) for text in inputs)
+
+
+def _probe_main() -> None:
+    import signal
+
+    probe = probe_regex(sys.argv[1])
+    # Only matching counts against the limit: the timer starts after the
+    # interpreter and this module are loaded. The default SIGVTALRM action
+    # kills the process even while a match holds the GIL.
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_VIRTUAL, float(sys.argv[2]))
+    for size, seconds in probe:
+        print(json.dumps([size, seconds]), flush=True)
+
+
+def _probe_output(output: Any) -> Dict[int, float]:
+    if isinstance(output, bytes):
+        output = output.decode("utf-8", "replace")
+    timings: Dict[int, float] = {}
+    for line in (output or "").splitlines():
+        size, seconds = json.loads(line)
+        timings[size] = seconds
+    return timings
+
+
+def _catastrophic(pattern: str, timings: Dict[int, float], limit: str) -> Dict[str, Any]:
+    size = next(size for size in PROBE_SIZES if size not in timings)
+    return {
+        "pattern": pattern,
+        "status": "catastrophic",
+        "detail": f"matching {size}-char inputs did not finish within {limit}",
+    }
+
+
+def check_regex(pattern: str, timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+    """Classify a pattern as ok, superlinear or catastrophic.
+
+    The probe runs in a child interpreter so a runaway match can be killed.
+    """
+    code = "from sis.rules.conformance import _probe_main; _probe_main()"
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", code, pattern, str(timeout)],
+            capture_output=True,
+            text=True,
+            timeout=max(PROBE_WALL_TIMEOUT, timeout),
+        )
+    except subprocess.TimeoutExpired as exc:
+        limit = f"{max(PROBE_WALL_TIMEOUT, timeout):g}s"
+        return _catastrophic(pattern, _probe_output(exc.stdout), limit)
+
+    sigvtalrm = getattr(signal, "SIGVTALRM", None)
+    if sigvtalrm is not None and result.returncode == -sigvtalrm:
+        limit = f"{timeout:g}s of CPU time"
+        return _catastrophic(pattern, _probe_output(result.stdout), limit)
+    if result.returncode != 0:
+        return {"pattern": pattern, "status": "invalid", "detail": result.stderr.strip()}
+
+    timings = _probe_output(result.stdout)
+    smallest, largest = PROBE_SIZES[0], PROBE_SIZES[-1]
+    growth = timings[largest] / max(timings[smallest], 1e-9)
+    doublings = math.log2(largest / smallest)
+    status = "ok"
+    if growth > SUPERLINEAR_RATIO ** doublings:
+        status = "superlinear"
+    return {
+        "pattern": pattern,
+        "status": status,
+        "detail": (
+            f"{timings[largest] * 1000:.2f} ms at {largest} chars, "
+            f"{growth:.0f}x the time at {smallest} chars"
+        ),
+    }
+
+
+def run_rule(rule_data: Dict[str, Any], repeat: int = 100) -> Dict[str, Any]:
+    """Evaluate one rule against its fixtures and probe its regexes."""
+    result: Dict[str, Any] = {
+        "rule_id": rule_data.get("rule_id", ""),
+        "source": rule_data.get("source", ""),
+        "cases": 0,
+        "failures": [],
+        "eval_us": None,
+        "regex": [],
+    }
+
+    try:
+        rule = Rule.from_dict(rule_data)
+    except (KeyError, ValueError) as exc:
+        result["failures"].append(f"invalid rule: {exc}")
+        result["status"] = "fail"
+        return result
+
+    tests = rule_data.get("tests", {}) or {}
+    cases = [(True, resource) for resource in tests.get("positive", [])]
+    cases += [(False, resource) for resource in tests.get("negative", [])]
+    result["cases"] = len(cases)
+
+    for index, (expected, resource) in enumerate(cases):
+        label = "positive" if expected else "negative"
+        try:
+            matched = rule.evaluate(resource)
+        except Exception as exc:
+            result["failures"].append(f"{label} case {index + 1} raised {exc!r}")
+            continue
+        if matched != expected:
+            outcome = "did not match" if expected else "matched"
+            result["failures"].append(f"{label} case {index + 1} {outcome}")
+
+    if cases and not result["failures"]:
+        start = time.thread_time()
+        for _ in range(repeat):
+            for _, resource in cases:
+                rule.evaluate(resource)
+        elapsed = time.thread_time() - start
+        result["eval_us"] = elapsed / (repeat * len(cases)) * 1e6
+
+    for condition in rule.conditions:
+        if condition.operator == Operator.REGEX:
+            result["regex"].append(check_regex(str(condition.value)))
+
+    if result["failures"] or any(
+        check["status"] in ("catastrophic", "invalid") for check in result["regex"]
+    ):
+        result["status"] = "fail"
+    elif not cases:
+        result["status"] = "untested"
+    elif any(check["status"] == "superlinear" for check in result["regex"]):
+        result["status"] = "warn"
+    else:
+        result["status"] = "pass"
+    return result
+
+
+def _load_cache(path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path: Optional[str], entries: Dict[str, Dict[str, Any]]) -> None:
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(entries, handle, indent=2, sort_keys=True)
+
+
+def run_conformance(
+    rules: List[Dict[str, Any]],
+    jobs: int = 1,
+    cache_path: Optional[str] = DEFAULT_CACHE,
+    repeat: int = 100,
+) -> List[Dict[str, Any]]:
+    """Run every rule, in parallel, reusing cached results for unchanged rules."""
+    cache = _load_cache(cache_path)
+    hashes = [rule_hash(rule) for rule in rules]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rules)
+
+    pending: List[int] = []
+    for index, key in enumerate(hashes):
+        cached = cache.get(key)
+        if cached is not None:
+            results[index] = dict(cached, source=rules[index].get("source", ""), cached=True)
+        else:
+            pending.append(index)
+
+    pending_rules = [rules[index] for index in pending]
+    if jobs > 1 and len(pending_rules) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            fresh = list(executor.map(run_rule, pending_rules, [repeat] * len(pending_rules)))
+    else:
+        fresh = [run_rule(rule, repeat) for rule in pending_rules]
+
+    for index, result in zip(pending, fresh, strict=True):
+        results[index] = dict(result, cached=False)
+        # Backtracking verdicts come from timings; they are re-checked on
+        # every run rather than pinned to the rule hash.
+        if all(check["status"] in ("ok", "invalid") for check in result["regex"]):
+            cache[hashes[index]] = result
+    _save_cache(cache_path, cache)
+    return results
@@ -0,0 +1,96 @@
+"""Sharded scanning and merging of partial scan results."""
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, Dict, List, Tuple
+
+
+class ShardError(ValueError):
+    """Raised for invalid shard specs or inconsistent partial results."""
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse an ``i/N`` shard spec (1-based) into (index, count)."""
+    try:
+        index_text, count_text = value.split("/", 1)
+        index, count = int(index_text), int(count_text)
+    except ValueError as exc:
+        raise ShardError(f"Invalid shard '{value}'; expected i/N") from exc
+    if count < 1 or not 1 <= index <= count:
+        raise ShardError(f"Invalid shard '{value}'; need 1 <= i <= N")
+    return index, count
+
+
+def _relative(path: str, target: str) -> str:
+    if os.path.isfile(target):
+        return os.path.basename(path)
+    return os.path.relpath(path, target).replace(os.sep, "/")
+
+
+def shard_of(path: str, target: str, count: int) -> int:
+    """Return the 1-based shard a file belongs to.
+
+    Uses a hash of the path relative to the target, so every machine agrees on
+    the partition regardless of where the tree is checked out.
+    """
+    digest = hashlib.sha256(_relative(path, target).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def walk_order_key(path: str, target: str) -> Tuple[Tuple[int, str], ...]:
+    """Sort key matching the CLI's sorted top-down directory walk.
+
+    Within a directory, files come before subdirectories, both by name.
+    """
+    parts = _relative(path, target).split("/")
+    return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+
+def _group_by_file(
+    items: List[Dict[str, Any]], target: str
+) -> List[Dict[str, Any]]:
+    # Sorting is stable, so per-file order from the shard is preserved.
+    return sorted(items, key=lambda item: walk_order_key(item["file"], target))
+
+
+def merge_partials(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge shard partial payloads into the payload of an unsharded scan."""
+    if not partials:
+        raise ShardError("No partial results to merge")
+
+    first = partials[0]
+    count = (first.get("shard") or {}).get("count")
+    seen = set()
+    for partial in partials:
+        shard = partial.get("shard") or {}
+        if shard.get("count") != count or count is None:
+            raise ShardError("Partial results come from different shard counts")
+        if partial.get("target") != first.get("target"):
+            raise ShardError("Partial results come from different targets")
+        if partial.get("rules") != first.get("rules"):
+            raise ShardError("Partial results come from different rulesets")
+        if shard.get("index") in seen:
+            raise ShardError(f"Duplicate shard {shard.get('index')}/{count}")
+        seen.add(shard.get("index"))
+
+    missing = sorted(set(range(1, count + 1)) - seen)
+    if missing:
+        raise ShardError(
+            "Missing shards: " + ", ".join(f"{index}/{count}" for index in missing)
+        )
+
+    target = first.get("target", "")
+    findings: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for partial in partials:
+        findings.extend(partial.get("findings", []))
+        errors.extend(partial.get("errors", []))
+
+    return {
+        "target": target,
+        "rules": first.get("rules"),
+        "total_files": sum(partial.get("total_files", 0) for partial in partials),
+        "findings": _group_by_file(findings, target),
+        "errors": _group_by_file(errors, target),
+    }
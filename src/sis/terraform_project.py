@@ -0,0 +1,205 @@
+"""Terraform project scanning with module graph resolution."""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from sis.engine import RuleEngine
+from sis.parsers.terraform import parse_terraform_module
+from sis.reader import DEFAULT_MAX_FILE_SIZE, FileTooLargeError, read_source
+
+
+def _is_terraform_file(name: str) -> bool:
+    lowered = name.lower()
+    return lowered.endswith(".tf") or lowered.endswith(".tf.json")
+
+
+def _is_local_source(source: str) -> bool:
+    # Terraform only treats ./ and ../ prefixes as local paths; anything else
+    # is a registry, VCS or archive source that is not on disk.
+    return source.startswith("./") or source.startswith("../")
+
+
+class ModuleScan:
+    """Findings, errors and local module calls for one module directory."""
+
+    def __init__(self) -> None:
+        self.findings: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.calls: List[Tuple[str, str]] = []
+
+
+class TerraformProject:
+    """Scan Terraform root modules and the local modules they call.
+
+    Each module directory is parsed and evaluated once per project; every
+    root that reaches it through ``module`` blocks reuses the memoized
+    result and gets the findings attributed to it.
+    """
+
+    def __init__(self, engine: RuleEngine, max_file_size: int = DEFAULT_MAX_FILE_SIZE):
+        self.engine = engine
+        self.max_file_size = max_file_size
+        self.modules: Dict[str, ModuleScan] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._reached: Set[str] = set()
+
+    def scan_module(self, directory: str) -> ModuleScan:
+        key = os.path.realpath(directory)
+        cached = self.modules.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        module = ModuleScan()
+        self.modules[key] = module
+
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError as exc:
+            module.errors.append({
+                "file": directory,
+                "error": "MODULE_NOT_FOUND",
+                "message": str(exc),
+            })
+            return module
+
+        for name in names:
+            path = os.path.join(directory, name)
+            if not _is_terraform_file(name) or not os.path.isfile(path):
+                continue
+            self._scan_file(module, path)
+
+        return module
+
+    def _scan_file(self, module: ModuleScan, path: str) -> None:
+        try:
+            content = read_source(path, "terraform", self.max_file_size)
+            resources, calls = parse_terraform_module(content)
+            for resource in resources:
+                resource_findings = self.engine.scan_resource(
+                    file_type="terraform",
+                    resource_kind=resource.get("kind", ""),
+                    resource=resource,
+                )
+
+                for finding in resource_findings:
+                    finding.update({
+                        "file": path,
+                        "line": resource.get("line", 1),
+                    })
+
+                module.findings.extend(resource_findings)
+        except FileTooLargeError as exc:
+            module.errors.append({
+                "file": path,
+                "error": "FILE_TOO_LARGE",
+                "message": str(exc),
+            })
+            return
+        except Exception as exc:
+            module.errors.append({
+                "file": path,
+                "error": "PARSE_ERROR",
+                "message": str(exc),
+            })
+            return
+
+        directory = os.path.dirname(path) or "."
+        for call in calls:
+            if _is_local_source(call["source"]):
+                source_dir = os.path.normpath(os.path.join(directory, call["source"]))
+                module.calls.append((call["name"], source_dir))
+
+    def scan_root(
+        self, root: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return findings for a root module and every local module it calls.
+
+        Findings are tagged with the calling ``root`` and the ``module``
+        address they were reached through (empty for the root itself).
+        """
+        findings: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        self._walk(root, root, "", set(), findings, errors)
+        return findings, errors
+
+    def _walk(
+        self,
+        root: str,
+        directory: str,
+        address: str,
+        active: Set[str],
+        findings: List[Dict[str, Any]],
+        errors: List[Dict[str, Any]],
+    ) -> None:
+        key = os.path.realpath(directory)
+        if key in active:
+            errors.append({
+                "file": directory,
+                "error": "MODULE_CYCLE",
+                "message": f"Module cycle via {address}",
+            })
+            return
+
+        self._reached.add(key)
+        module = self.scan_module(directory)
+        for finding in module.findings:
+            findings.append(dict(finding, root=root, module=address))
+        errors.extend(module.errors)
+
+        active.add(key)
+        for name, source_dir in module.calls:
+            child = f"{address}.module.{name}" if address else f"module.{name}"
+            self._walk(root, source_dir, child, active, findings, errors)
+        active.discard(key)
+
+    def _directories(self, paths: Iterable[str]) -> List[str]:
+        return sorted({
+            # A bare file name lives in the current directory, not "".
+            os.path.dirname(path) or "." for path in paths if _is_terraform_file(path)
+        })
+
+    def find_roots(self, paths: Iterable[str]) -> List[str]:
+        """Return module directories among paths that no other module calls."""
+        directories = self._directories(paths)
+
+        called: Set[str] = set()
+        for directory in directories:
+            for _, source_dir in self.scan_module(directory).calls:
+                called.add(os.path.realpath(source_dir))
+
+        return [
+            directory for directory in directories
+            if os.path.realpath(directory) not in called
+        ]
+
+    def _iter_roots(self, paths: List[str]) -> Iterable[str]:
+        yield from self.find_roots(paths)
+        # Modules that only call each other have no root; any directory still
+        # unreached after the real roots is scanned as a root of its own.
+        for directory in self._directories(paths):
+            if os.path.realpath(directory) not in self._reached:
+                yield directory
+
+    def scan(
+        self, paths: Iterable[str]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Scan all root modules found among the given file paths."""
+        findings: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+        reported: Set[str] = set()
+
+        for root in self._iter_roots(list(paths)):
+            root_findings, root_errors = self.scan_root(root)
+            findings.extend(root_findings)
+            # A broken shared module is reported once, not once per root.
+            for error in root_errors:
+                marker = f"{error['file']}\0{error['error']}"
+                if marker not in reported:
+                    reported.add(marker)
+                    errors.append(error)
+
+        return findings, errors
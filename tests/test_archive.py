@@ -0,0 +1,128 @@
+"""Test archive upload scanning."""
+import asyncio
+import io
+import tarfile
+import zipfile
+import pytest
+from sis.api.archive import ArchiveError, ArchiveLimitError, iter_archive_members
+from fastapi import HTTPException
+from sis.main import UploadSizeLimit, scan_archive
+
+TERRAFORM = b'''resource "aws_instance" "web" {
+  service_account = "web-sa"
+}
+'''
+
+def _tar_gz(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+@pytest.mark.parametrize("build", [_tar_gz, _zip])
+def test_scan_archive_detects_types(build):
+    """Test that archive members are typed by extension and scanned."""
+    archive = build({"infra/main.tf": TERRAFORM, "README.md": b"# docs"})
+    total_files, findings, errors = scan_archive(archive)
+    
+    assert total_files == 2
+    assert errors == []
+    assert [f["rule_id"] for f in findings] == ["IRR-IDENT-07"]
+    assert findings[0]["file"] == "infra/main.tf"
+
+def test_archive_member_limit():
+    """Test that member limits are enforced while iterating."""
+    archive = _tar_gz({f"f{i}.tf": b"" for i in range(3)})
+    members = iter_archive_members(
+        archive, max_members=2, max_member_size=1024, max_total_size=1024
+    )
+    with pytest.raises(ArchiveLimitError):
+        list(members)
+
+def test_archive_size_limit():
+    """Test that oversized members are rejected."""
+    archive = _zip({"big.tf": b"x" * 2048})
+    members = iter_archive_members(
+        archive, max_members=10, max_member_size=1024, max_total_size=4096
+    )
+    with pytest.raises(ArchiveLimitError):
+        list(members)
+
+def test_invalid_archive():
+    """Test that non-archive uploads are rejected."""
+    members = iter_archive_members(
+        io.BytesIO(b"not an archive"),
+        max_members=10, max_member_size=1024, max_total_size=4096
+    )
+    with pytest.raises(ArchiveError):
+        list(members)
+
+def test_truncated_archive():
+    """Test that an archive cut off mid-member is rejected, not a server error."""
+    data = _tar_gz({"main.tf": bytes(range(256)) * 512}).getvalue()
+    members = iter_archive_members(
+        io.BytesIO(data[: len(data) // 2]),
+        max_members=10, max_member_size=1024 * 1024, max_total_size=1024 * 1024
+    )
+    with pytest.raises(ArchiveError):
+        list(members)
+
+def test_corrupt_zip_member():
+    """Test that a zip member failing its CRC check is rejected."""
+    content = b"resource {}\n" * 100
+    data = bytearray(_zip({"main.tf": content}).getvalue())
+    offset = data.index(content[:12])
+    data[offset] ^= 0xFF
+    members = iter_archive_members(
+        io.BytesIO(bytes(data)),
+        max_members=10, max_member_size=1024 * 1024, max_total_size=1024 * 1024
+    )
+    with pytest.raises(ArchiveError):
+        list(members)
+
+def _upload(chunks, headers=()):
+    """Feed body chunks through UploadSizeLimit; return the bytes the app read."""
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+        for index, chunk in enumerate(chunks)
+    ]
+    received = []
+    
+    async def receive():
+        return messages.pop(0)
+    
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            received.append(message["body"])
+            if not message["more_body"]:
+                return
+    
+    scope = {"type": "http", "path": "/v1/scan/archive", "headers": list(headers)}
+    asyncio.run(UploadSizeLimit(app, ["/v1/scan/archive"], 1024)(scope, receive, None))
+    return b"".join(received)
+
+def test_upload_limit_while_streaming():
+    """Test that uploads are cut off once the byte cap is crossed."""
+    assert _upload([b"x" * 512, b"x" * 512]) == b"x" * 1024
+    with pytest.raises(HTTPException) as excinfo:
+        _upload([b"x" * 512] * 4)
+    assert excinfo.value.status_code == 413
+
+def test_upload_limit_content_length():
+    """Test that a declared oversized body is refused before it is read."""
+    with pytest.raises(HTTPException) as excinfo:
+        _upload([b"x"], headers=[(b"content-length", b"4096")])
+    assert excinfo.value.status_code == 413
@@ -0,0 +1,87 @@
+"""Test per-file scan result cache."""
+import json
+import os
+from sis.api.cache import ScanCache
+from sis import main
+
+def test_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = ScanCache("rules", max_entries=2)
+    cache.put("a", ([], []))
+    cache.put("b", ([], []))
+    cache.get("a")
+    cache.put("c", ([], []))
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+def test_disk_tier(tmp_path):
+    """Test that entries survive in the on-disk tier."""
+    first = ScanCache("rules", directory=str(tmp_path))
+    key = first.key("terraform", "content")
+    first.put(key, ([{"rule_id": "X"}], []))
+    
+    second = ScanCache("rules", directory=str(tmp_path))
+    assert second.get(key) == ([{"rule_id": "X"}], [])
+
+def test_invalidate_prunes_disk_tier(tmp_path):
+    """Test that on-disk entries of an old ruleset are removed."""
+    cache = ScanCache("v1", directory=str(tmp_path))
+    old_key = cache.key("terraform", "content")
+    cache.put(old_key, ([], []))
+    cache.invalidate("v2")
+    new_key = cache.key("terraform", "content")
+    cache.put(new_key, ([], []))
+    
+    assert len(os.listdir(tmp_path)) == 1
+    assert ScanCache("v2", directory=str(tmp_path)).get(new_key) == ([], [])
+    assert ScanCache("v1", directory=str(tmp_path)).get(old_key) is None
+
+def test_key_depends_on_ruleset():
+    """Test that invalidation changes keys and clears memory."""
+    cache = ScanCache("v1")
+    key = cache.key("terraform", "content")
+    cache.put(key, ([], []))
+    cache.invalidate("v2")
+    
+    assert cache.key("terraform", "content") != key
+    assert cache.get(key) is None
+
+def test_scan_content_hit_matches_miss():
+    """Test that cached results match a fresh scan apart from file name."""
+    with open("examples/terraform/main.tf", "r", encoding="utf-8") as handle:
+        content = handle.read()
+    
+    main.reload_rules()
+    first = main.scan_content("a.tf", "terraform", content)
+    hits = main.get_cache().hits
+    second = main.scan_content("b.tf", "terraform", content)
+    
+    assert main.get_cache().hits == hits + 1
+    assert [dict(f, file="b.tf") for f in first[0]] == second[0]
+    assert list(first[0][0]) == list(second[0][0])
+
+def test_rules_reloaded_when_file_changes(tmp_path, monkeypatch):
+    """Test that the API picks up an edited rules file."""
+    with open("rules/demo.json", "r", encoding="utf-8") as handle:
+        rules = json.load(handle)
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(rules))
+    monkeypatch.setenv("SIS_RULES", str(rules_file))
+    monkeypatch.setattr(main, "_engine", None)
+    monkeypatch.setattr(main, "_cache", None)
+    monkeypatch.setattr(main, "_rules_stamp", None)
+    with open("examples/terraform/main.tf", "r", encoding="utf-8") as handle:
+        content = handle.read()
+    
+    first, _ = main.scan_content("main.tf", "terraform", content)
+    for rule in rules["rules"]:
+        rule["message"] = "Edited"
+    rules_file.write_text(json.dumps(rules))
+    os.utime(rules_file, ns=(0, 0))
+    second, _ = main.scan_content("main.tf", "terraform", content)
+    
+    assert first and all(f["message"] != "Edited" for f in first)
+    assert [f["message"] for f in second] == ["Edited"] * len(first)
@@ -0,0 +1,106 @@
+"""Test rule conformance runner."""
+import json
+from sis.engine import RuleEngine
+from sis.rules.conformance import (
+    check_regex,
+    load_rule_definitions,
+    run_conformance,
+    run_rule,
+)
+
+RULE = {
+    "rule_id": "TEST-01",
+    "rule_type": "IRREVERSIBLE_DECISION",
+    "applies_to": {"file_types": ["terraform"], "resource_kinds": ["*"]},
+    "detection": {
+        "match_logic": "ALL",
+        "conditions": [{"path": "deletion_protection", "operator": "EQUALS", "value": True}]
+    },
+    "message": "Test rule",
+    "tests": {
+        "positive": [{"deletion_protection": True}],
+        "negative": [{"deletion_protection": False}]
+    }
+}
+
+def test_run_rule_pass_and_fail():
+    """Test that fixtures are checked against expectations."""
+    assert run_rule(RULE, repeat=1)["status"] == "pass"
+    
+    broken = dict(RULE, tests={"positive": [{}], "negative": []})
+    result = run_rule(broken, repeat=1)
+    assert result["status"] == "fail"
+    assert result["failures"] == ["positive case 1 did not match"]
+
+def test_catastrophic_regex_flagged():
+    """Test that exponential backtracking is detected via the probe timeout."""
+    result = check_regex(r"(a+)+$", timeout=1.0)
+    assert result["status"] == "catastrophic"
+    assert result["detail"] == "matching 256-char inputs did not finish within 1s of CPU time"
+    assert check_regex(r"abc", timeout=5.0)["status"] == "ok"
+
+def test_timing_verdicts_not_cached(tmp_path):
+    """Test that backtracking warnings are re-probed instead of cached."""
+    cache = str(tmp_path / "cache.json")
+    quadratic = dict(
+        RULE,
+        detection={
+            "match_logic": "ALL",
+            "conditions": [{"path": "email", "operator": "REGEX", "value": r".*@.*\.example\.com"}],
+        },
+        tests={"positive": [{"email": "a@b.example.com"}], "negative": [{"email": "a@b"}]},
+    )
+    
+    first = run_conformance([RULE, quadratic], cache_path=cache, repeat=1)
+    second = run_conformance([RULE, quadratic], cache_path=cache, repeat=1)
+    
+    assert [r["status"] for r in first] == ["pass", "warn"]
+    assert [r["cached"] for r in second] == [True, False]
+
+def test_results_cached_by_rule_hash(tmp_path):
+    """Test that only changed rules are re-run."""
+    cache = str(tmp_path / "cache.json")
+    changed = dict(RULE, message="Changed")
+    
+    first = run_conformance([RULE], cache_path=cache, repeat=1)
+    second = run_conformance([RULE, changed], cache_path=cache, repeat=1)
+    
+    assert [r["cached"] for r in first] == [False]
+    assert [r["cached"] for r in second] == [True, False]
+
+def test_test_vectors_conform():
+    """Test that every shipped test vector passes its fixtures."""
+    rules, errors = load_rule_definitions(["tests/test_vectors"])
+    results = run_conformance(rules, jobs=2, cache_path=None, repeat=1)
+    
+    assert errors == []
+    assert [r["rule_id"] for r in results if r["status"] == "fail"] == []
+
+def test_profiles_not_loaded_as_rules(tmp_path):
+    """Test that a selectivity profile next to the rules is skipped."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps({"rules": [RULE]}))
+    engine = RuleEngine(str(rules_file))
+    engine.profiling = True
+    engine.scan_resource("terraform", "x", {"deletion_protection": True})
+    engine.save_profile()
+    
+    rules, errors = load_rule_definitions([str(tmp_path)])
+    
+    assert errors == []
+    assert [r["rule_id"] for r in rules] == ["TEST-01"]
+
+def test_non_object_files_reported(tmp_path):
+    """Test that arrays, scalars and non-object rules become load errors."""
+    (tmp_path / "a.json").write_text("[1, 2]")
+    (tmp_path / "b.json").write_text("3")
+    (tmp_path / "c.json").write_text(json.dumps({"rules": [RULE, "oops"]}))
+    
+    rules, errors = load_rule_definitions([str(tmp_path)])
+    
+    assert [r["rule_id"] for r in rules] == ["TEST-01"]
+    assert [(e["file"][-6:], e["error"]) for e in errors] == [
+        ("a.json", "LOAD_ERROR"),
+        ("b.json", "LOAD_ERROR"),
+        ("c.json", "LOAD_ERROR"),
+    ]
@@ -44,4 +44,131 @@ def test_rule_evaluation():
     resource = {"lifecycle": {"prevent_destroy": False}}
     assert not rule.evaluate(resource)
 
-# Additional tests for each rule...
\ No newline at end of file
+# Additional tests for each rule...
+
+def _rule(match_logic, conditions, rule_id="TEST-02"):
+    return Rule(
+        rule_id=rule_id,
+        rule_type=RuleType.DECISION,
+        applies_to={"file_types": ["terraform"], "resource_kinds": ["*"]},
+        detection={"match_logic": match_logic, "conditions": conditions},
+        message="Test rule"
+    )
+
+def _file_order(rule, resource):
+    logic = all if rule.match_logic.value == "ALL" else any
+    try:
+        return logic(cond.evaluate(resource) for cond in rule.conditions)
+    except Exception as exc:
+        return type(exc)
+
+def _ordered(rule, resource):
+    try:
+        return rule.evaluate(resource)
+    except Exception as exc:
+        return type(exc)
+
+CONDITIONS = [
+    {"path": "name", "operator": "REGEX", "value": ".*-prod-.*"},
+    {"path": "size", "operator": "GREATER_THAN", "value": 5},
+    {"path": "tier", "operator": "EQUALS", "value": "gold"},
+    {"path": "labels", "operator": "CONTAINS", "value": "pii"},
+]
+
+RESOURCES = [
+    {},
+    {"name": "db-prod-1", "size": 10, "tier": "gold", "labels": "pii"},
+    {"name": "db-prod-1", "size": "large", "tier": "gold"},
+    {"name": "db-dev-1", "size": "large", "tier": "silver"},
+    {"size": None, "tier": "gold", "labels": ["pii"]},
+    {"name": "db-prod-2", "size": 1, "tier": "silver", "labels": "pii"},
+]
+
+def test_cheap_selective_conditions_run_first():
+    """EQUALS is tried before REGEX regardless of file order."""
+    rule = _rule("ALL", CONDITIONS)
+    assert rule.order[0] == 2
+    assert rule.order[-1] == 0
+
+def test_ordering_matches_file_order_results():
+    """Every evaluation order gives the file-order result, errors included."""
+    for match_logic in ("ALL", "ANY"):
+        rule = _rule(match_logic, CONDITIONS)
+        for order in ([0, 1, 2, 3], [3, 2, 1, 0], [2, 0, 3, 1], [1, 3, 0, 2]):
+            rule.order = order
+            for resource in RESOURCES:
+                assert _ordered(rule, resource) == _file_order(rule, resource)
+
+def test_reordering_does_not_hide_errors():
+    """A raising condition listed first still raises when a later one fails."""
+    rule = _rule("ALL", [CONDITIONS[1], CONDITIONS[2]])
+    assert rule.order == [1, 0]
+    with pytest.raises(ValueError):
+        rule.evaluate({"size": "large", "tier": "silver"})
+
+def test_shared_conditions_evaluated_once(monkeypatch, tmp_path):
+    """Identical conditions in different rules share one evaluation."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps({"rules": [
+        {
+            "rule_id": f"TEST-{index}",
+            "rule_type": "IRREVERSIBLE_DECISION",
+            "applies_to": {"file_types": ["terraform"], "resource_kinds": ["*"]},
+            "detection": {"match_logic": "ALL", "conditions": [CONDITIONS[0]]},
+            "message": "Test rule"
+        } for index in range(3)
+    ]}))
+    engine = RuleEngine(str(rules_file))
+    
+    calls = []
+    evaluate = Condition.evaluate
+    monkeypatch.setattr(
+        Condition, "evaluate",
+        lambda self, resource: calls.append(self.path) or evaluate(self, resource)
+    )
+    findings = engine.scan_resource("terraform", "aws_db_instance", RESOURCES[1])
+    assert len(findings) == 3
+    assert calls == ["name"]
+
+def test_profile_refines_order(tmp_path):
+    """Profiled match rates are saved next to the rules and reorder conditions."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps({"ruleset_version": "t", "rules": [{
+        "rule_id": "TEST-03",
+        "rule_type": "IRREVERSIBLE_DECISION",
+        "applies_to": {"file_types": ["terraform"], "resource_kinds": ["*"]},
+        "detection": {"match_logic": "ALL", "conditions": [
+            {"path": "tier", "operator": "EQUALS", "value": "gold"},
+            {"path": "region", "operator": "EQUALS", "value": "eu"},
+        ]},
+        "message": "Test rule"
+    }]}))
+    engine = RuleEngine(str(rules_file))
+    assert engine.rules[0].order == [0, 1]
+    
+    engine.profiling = True
+    for index in range(50):
+        engine.scan_resource("terraform", "x", {"tier": "gold", "region": f"r{index}"})
+    assert engine.save_profile() == str(tmp_path / "rules.profile.json")
+    
+    profiled = RuleEngine(str(rules_file))
+    assert profiled.rules[0].order == [1, 0]
+
+@pytest.mark.parametrize("content", ["{not json", "[1, 2]", '{"conditions": {"k": 3}}'])
+def test_bad_profile_ignored(tmp_path, content):
+    """An unreadable profile is ignored with a warning and the static order used."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps({"rules": [{
+        "rule_id": "TEST-04",
+        "rule_type": "IRREVERSIBLE_DECISION",
+        "applies_to": {"file_types": ["terraform"], "resource_kinds": ["*"]},
+        "detection": {"match_logic": "ALL", "conditions": CONDITIONS},
+        "message": "Test rule"
+    }]}))
+    (tmp_path / "rules.profile.json").write_text(content)
+    
+    with pytest.warns(RuntimeWarning, match="Ignoring selectivity profile") as record:
+        engine = RuleEngine(str(rules_file))
+    assert record[0].filename == __file__
+    assert engine.profile == {}
+    assert engine.rules[0].order == _rule("ALL", CONDITIONS).order
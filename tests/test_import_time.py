@@ -0,0 +1,26 @@
+"""Test CLI startup cost."""
+import subprocess
+import sys
+
+def test_cli_import_budget():
+    """Test that importing the CLI stays within budget and loads no parser backends."""
+    result = subprocess.run(
+        [sys.executable, "benchmarks/bench_import.py", "--module", "sis.cli"],
+        capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stdout
+
+def test_parser_loaded_on_first_use():
+    """Test that only the requested parser backend is imported."""
+    code = (
+        "import sys\n"
+        "from sis.parsers import parse_file\n"
+        "parse_file('arm', '{}')\n"
+        "assert 'yaml' not in sys.modules and 'hcl2' not in sys.modules\n"
+        "parse_file('kubernetes', 'kind: ServiceAccount')\n"
+        "assert 'yaml' in sys.modules and 'hcl2' not in sys.modules\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,109 @@
+"""Test asynchronous scan jobs."""
+import time
+import pytest
+from sis.api.jobs import (
+    FairQueue,
+    JobManager,
+    JobStore,
+    QueueFullError,
+)
+from sis.api.schemas import JobStatus
+
+def _fake_scan(name, file_type, content):
+    findings = [{
+        "rule_id": "TEST-01",
+        "rule_type": "IRREVERSIBLE_DECISION",
+        "message": content,
+        "resource_kind": file_type,
+        "resource_name": name,
+        "file": name,
+        "line": 1,
+    }]
+    return findings, []
+
+def _job_status(manager, job_id):
+    return manager.store.get(job_id)["status"]
+
+def test_fair_queue_round_robin():
+    """Test that keys take turns regardless of submission order."""
+    queue = FairQueue()
+    for item in ("a1", "a2", "a3"):
+        queue.put("a", item)
+    queue.put("b", "b1")
+    
+    assert [queue.get() for _ in range(4)] == ["a1", "b1", "a2", "a3"]
+
+def test_fair_queue_bounds():
+    """Test that per-key and global limits are enforced."""
+    queue = FairQueue(max_pending=3, max_per_key=2)
+    queue.put("a", 1)
+    queue.put("a", 2)
+    with pytest.raises(QueueFullError):
+        queue.put("a", 3)
+    queue.put("b", 1)
+    with pytest.raises(QueueFullError):
+        queue.put("c", 1)
+
+def test_job_results_and_progress():
+    """Test that a job records progress, summary and paged results."""
+    store = JobStore()
+    manager = JobManager(_fake_scan, store)
+    job_id = store.create("key", "scan", 3)
+    manager.run_job(job_id, [(f"f{i}.tf", "terraform", str(i)) for i in range(3)])
+    
+    job = store.get(job_id)
+    assert job["status"] == JobStatus.COMPLETED
+    assert job["files_done"] == 3
+    assert job["summary"]["by_type"]["IRREVERSIBLE_DECISION"] == 3
+    assert [f["message"] for f in store.results(job_id, "finding", 1, 2)] == ["1", "2"]
+    assert len(list(store.iter_results(job_id, "finding", batch_size=2))) == 3
+
+def test_job_submit_runs_in_background():
+    """Test that submitted jobs complete on worker threads."""
+    manager = JobManager(_fake_scan, JobStore(), workers=1)
+    job_id = manager.submit("key", "scan", [("main.tf", "terraform", "x")])
+    
+    deadline = time.time() + 5
+    while _job_status(manager, job_id) != JobStatus.COMPLETED and time.time() < deadline:
+        time.sleep(0.01)
+    assert _job_status(manager, job_id) == JobStatus.COMPLETED
+
+def test_purge_expired():
+    """Test that finished jobs past their TTL are removed."""
+    store = JobStore(ttl=0)
+    manager = JobManager(_fake_scan, store)
+    job_id = store.create("key", "scan", 1)
+    manager.run_job(job_id, [("main.tf", "terraform", "x")])
+    
+    assert store.purge_expired() == 1
+    assert store.get(job_id) is None
+    assert store.results(job_id, "finding") == []
+
+def test_fair_queue_get_timeout():
+    """Test that get returns None when nothing is queued in time."""
+    assert FairQueue().get(timeout=0.01) is None
+
+def test_manager_purge_throttled():
+    """Test that lookups purge expired jobs at most once per interval."""
+    store = JobStore()
+    manager = JobManager(_fake_scan, store, purge_interval=3600)
+    store.ttl = 0
+    first = store.create("key", "scan", 1)
+    manager.run_job(first, [("main.tf", "terraform", "x")])
+    
+    assert manager.purge_expired() == 1
+    second = store.create("key", "scan", 1)
+    manager.run_job(second, [("main.tf", "terraform", "x")])
+    assert manager.purge_expired() == 0
+    assert store.get(second) is not None
+
+def test_idle_worker_purges_expired():
+    """Test that workers purge expired jobs without further submissions."""
+    store = JobStore(ttl=0.05)
+    manager = JobManager(_fake_scan, store, workers=1, purge_interval=0)
+    job_id = manager.submit("key", "scan", [("main.tf", "terraform", "x")])
+    
+    deadline = time.time() + 5
+    while store.get(job_id) is not None and time.time() < deadline:
+        time.sleep(0.05)
+    assert store.get(job_id) is None
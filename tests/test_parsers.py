@@ -0,0 +1,64 @@
+"""Test IaC parsers."""
+import json
+from sis.parsers import parse_file
+
+def test_arm_nested_resources():
+    """Test that nested child resources get qualified types and names."""
+    template = {
+        "$schema": "https://schema.management.azure.com/schemas/2019-04-01/deploymentTemplate.json#",
+        "contentVersion": "1.0.0.0",
+        "resources": [{
+            "type": "Microsoft.Sql/servers",
+            "name": "sql",
+            "kind": "v12.0",
+            "properties": {"version": "12.0"},
+            "resources": [
+                {"type": "databases", "name": "db", "properties": {}},
+                {"type": "Microsoft.Sql/servers/firewallRules", "name": "sql/allow"},
+            ],
+        }, {
+            "type": "Microsoft.Network/publicIPAddresses",
+            "name": "[concat('ip', copyIndex())]",
+            "copy": {"name": "ips", "count": 3},
+        }],
+    }
+    resources = parse_file("arm", json.dumps(template))
+    
+    assert [(r["kind"], r["name"]) for r in resources] == [
+        ("Microsoft.Sql/servers", "sql"),
+        ("Microsoft.Sql/servers/databases", "sql/db"),
+        ("Microsoft.Sql/servers/firewallRules", "sql/allow"),
+        ("Microsoft.Network/publicIPAddresses", "[concat('ip', copyIndex())]"),
+    ]
+    assert resources[0]["arm_kind"] == "v12.0"
+    assert resources[0]["properties"] == {"version": "12.0"}
+    assert "resources" not in resources[0]
+    assert resources[3]["copy"]["count"] == 3
+
+def test_arm_skips_non_template_json():
+    """Test that unrelated JSON files are not treated as templates."""
+    assert parse_file("arm", '{"name": "pkg", "resources": [1]}') == []
+
+def test_docker_compose_sections():
+    """Test that services, volumes and networks are extracted."""
+    content = """
+services:
+  db:
+    image: postgres
+    volumes:
+      - data:/var/lib/postgresql/data
+volumes:
+  data:
+networks:
+  backend:
+    driver: bridge
+"""
+    resources = parse_file("docker_compose", content)
+    
+    assert [(r["kind"], r["name"]) for r in resources] == [
+        ("service", "db"),
+        ("volume", "data"),
+        ("network", "backend"),
+    ]
+    assert resources[0]["image"] == "postgres"
+    assert resources[2]["driver"] == "bridge"
@@ -0,0 +1,41 @@
+"""Test size-aware file reading."""
+import json
+import pytest
+from sis import reader
+from sis.cli import _scan_file
+from sis.engine import RuleEngine
+from sis.reader import FileTooLargeError, read_source
+
+def test_file_too_large(tmp_path):
+    """Test that oversized files are rejected before reading."""
+    path = tmp_path / "big.tf"
+    path.write_text("x" * 100)
+    with pytest.raises(FileTooLargeError):
+        read_source(str(path), "terraform", max_size=10)
+
+def test_scan_file_reports_too_large(tmp_path):
+    """Test that the CLI reports FILE_TOO_LARGE instead of failing."""
+    path = tmp_path / "big.tf"
+    path.write_text("x" * 100)
+    findings, errors = _scan_file(RuleEngine("rules/demo.json"), str(path), "terraform", 10)
+    
+    assert findings == []
+    assert [e["error"] for e in errors] == ["FILE_TOO_LARGE"]
+
+def test_newlines_match_text_mode(tmp_path):
+    """Test that CRLF content reads the same as a text-mode read."""
+    path = tmp_path / "main.tf"
+    path.write_bytes(b'resource "a" "b" {\r\n  x = 1\r\n}\r\n')
+    with open(path, "r", encoding="utf-8") as handle:
+        assert read_source(str(path), "terraform") == handle.read()
+
+def test_mmap_sniff(tmp_path, monkeypatch):
+    """Test that large JSON is memory-mapped and non-templates are skipped."""
+    monkeypatch.setattr(reader, "MMAP_THRESHOLD", 1)
+    other = tmp_path / "package.json"
+    other.write_text(json.dumps({"name": "pkg"}))
+    template = tmp_path / "template.json"
+    template.write_text(json.dumps({"contentVersion": "1.0.0.0", "resources": []}))
+    
+    assert read_source(str(other), "arm") == ""
+    assert json.loads(read_source(str(template), "arm"))["resources"] == []
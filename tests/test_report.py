@@ -0,0 +1,113 @@
+"""Test streaming report generation."""
+import argparse
+import io
+import json
+import re
+import pytest
+from sis import jsonstream
+from sis.cli import report_command
+from sis.jsonstream import iter_array_member, iter_members, read_members
+from sis.report import render_markdown_report, write_markdown_report, write_sarif_report
+
+def _payload():
+    with open("examples/expected/terraform.json", "r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    payload["errors"] = [{"file": "bad.yaml", "error": "PARSE_ERROR", "message": "a | b"}]
+    return payload
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 7])
+def test_iter_members_across_chunks(monkeypatch, chunk_size):
+    """Test incremental decoding when values straddle chunk boundaries."""
+    monkeypatch.setattr(jsonstream, "CHUNK_SIZE", chunk_size)
+    text = (
+        '{"total_files": 12345, "ratio": 1.5, "tiny": -1e-07, "big": 2E+10,'
+        ' "findings": [{"line": 10}, {"line": 200, "score": 0.25}], "x": [1.0, 2]}'
+    )
+    members = list(iter_members(io.StringIO(text), stream={"findings"}, skip={"x"}))
+    
+    assert members == [
+        ("total_files", 12345),
+        ("ratio", 1.5),
+        ("tiny", -1e-07),
+        ("big", 2e10),
+        ("findings", {"line": 10}),
+        ("findings", {"line": 200, "score": 0.25}),
+    ]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 16, 64 * 1024])
+def test_skipped_members_not_decoded(monkeypatch, chunk_size):
+    """Test that skipped arrays are scanned past, including brackets in strings."""
+    monkeypatch.setattr(jsonstream, "CHUNK_SIZE", chunk_size)
+    tricky = {"message": 'a "quoted" ] } [ {', "path": "c:\\dir\\", "nested": [[{"x": []}]]}
+    text = json.dumps({
+        "findings": [tricky, {"line": 1}] * 20,
+        "target": "t",
+        "errors": [{"message": "]"}],
+        "total_files": 3,
+    })
+    
+    members = list(iter_members(io.StringIO(text), skip={"findings", "errors"}))
+    assert members == [("target", "t"), ("total_files", 3)]
+    
+    with pytest.raises(ValueError):
+        list(iter_members(io.StringIO(text[:-30]), skip={"findings", "errors"}))
+
+def test_streamed_markdown_matches_in_memory(tmp_path):
+    """Test that the streamed report equals the in-memory renderer."""
+    path = str(tmp_path / "scan.json")
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(_payload(), handle, indent=2)
+    
+    output = io.StringIO()
+    write_markdown_report(
+        output,
+        read_members(path, skip={"findings", "errors"}),
+        iter_array_member(path, "findings"),
+        iter_array_member(path, "errors"),
+    )
+    
+    def strip(text):
+        return re.sub(r"Generated: .*", "", text)
+    assert strip(output.getvalue()) == strip(render_markdown_report(_payload()))
+
+def test_sarif_output():
+    """Test that SARIF output is a valid 2.1.0 log with results and notifications."""
+    payload = _payload()
+    output = io.StringIO()
+    write_sarif_report(output, iter(payload["findings"]), iter(payload["errors"]))
+    sarif = json.loads(output.getvalue())
+    
+    run = sarif["runs"][0]
+    assert sarif["version"] == "2.1.0"
+    assert len(run["results"]) == len(payload["findings"])
+    assert {r["ruleId"] for r in run["results"]} == {r["id"] for r in run["tool"]["driver"]["rules"]}
+    location = run["results"][0]["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == "examples/terraform/main.tf"
+    assert location["region"]["startLine"] == 1
+    assert run["invocations"][0]["executionSuccessful"] is False
+    assert run["invocations"][0]["toolExecutionNotifications"][0]["descriptor"]["id"] == "PARSE_ERROR"
+
+def test_report_keeps_output_on_bad_input(tmp_path):
+    """Test that a malformed input does not truncate an existing report."""
+    source = tmp_path / "scan.json"
+    source.write_text('{"target": "x", "findings": [{"line": 1},')
+    output = tmp_path / "report.md"
+    output.write_text("previous report")
+    
+    args = argparse.Namespace(input=str(source), output=str(output), format="markdown")
+    with pytest.raises(ValueError):
+        report_command(args)
+    assert output.read_text() == "previous report"
+
+def test_report_keeps_output_when_input_missing(tmp_path):
+    """Test that a missing input leaves no temporary or partial output."""
+    output = tmp_path / "report.sarif"
+    output.write_text("previous report")
+    
+    args = argparse.Namespace(
+        input=str(tmp_path / "missing.json"), output=str(output), format="sarif"
+    )
+    with pytest.raises(OSError):
+        report_command(args)
+    assert output.read_text() == "previous report"
+    assert [p.name for p in tmp_path.iterdir()] == ["report.sarif"]
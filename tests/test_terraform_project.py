@@ -0,0 +1,79 @@
+"""Test Terraform project scanning."""
+import json
+import os
+import sys
+from sis.cli import main
+from sis.engine import RuleEngine
+from sis.terraform_project import TerraformProject
+
+SHARED = '''resource "google_compute_instance" "db" {
+  deletion_protection = true
+}
+'''
+
+ROOT = '''module "db" {
+  source = "../../modules/db"
+}
+module "remote" {
+  source = "hashicorp/consul/aws"
+}
+'''
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+    return path
+
+def test_shared_module_scanned_once(tmp_path):
+    """Test that a shared module is parsed once and attributed to each root."""
+    paths = [_write(str(tmp_path / "modules/db/main.tf"), SHARED)]
+    for env in ("dev", "prod"):
+        paths.append(_write(str(tmp_path / f"envs/{env}/main.tf"), ROOT))
+    
+    project = TerraformProject(RuleEngine("rules/demo.json"))
+    findings, errors = project.scan(paths)
+    
+    assert errors == []
+    assert project.cache_misses == 3
+    assert [(os.path.basename(f["root"]), f["module"]) for f in findings] == [
+        ("dev", "module.db"),
+        ("prod", "module.db"),
+    ]
+    assert {f["rule_id"] for f in findings} == {"IRR-DEC-01"}
+
+def test_module_cycle(tmp_path):
+    """Test that module cycles are reported instead of recursing forever."""
+    paths = [
+        _write(str(tmp_path / "a/main.tf"), 'module "b" {\n  source = "../b"\n}\n'),
+        _write(str(tmp_path / "b/main.tf"), 'module "a" {\n  source = "../a"\n}\n'),
+    ]
+    
+    findings, errors = TerraformProject(RuleEngine("rules/demo.json")).scan(paths)
+    
+    assert findings == []
+    assert [e["error"] for e in errors] == ["MODULE_CYCLE"]
+
+def test_bare_filename_target(tmp_path, monkeypatch):
+    """Test that a file in the current directory resolves its local modules."""
+    _write(str(tmp_path / "modules/db/main.tf"), SHARED)
+    _write(str(tmp_path / "main.tf"), 'module "db" {\n  source = "./modules/db"\n}\n')
+    rules = os.path.abspath("rules/demo.json")
+    monkeypatch.chdir(tmp_path)
+    
+    findings, errors = TerraformProject(RuleEngine(rules)).scan(["main.tf"])
+    
+    assert errors == []
+    assert [(f["root"], f["module"]) for f in findings] == [(".", "module.db")]
+
+def test_forced_type_outside_project(tmp_path, monkeypatch, capsys):
+    """Test that non-.tf files forced to terraform are still scanned."""
+    target = _write(str(tmp_path / "x.hcl"), SHARED)
+    monkeypatch.setattr(sys, "argv", [
+        "sis", "scan", "-t", target, "--type", "terraform",
+        "--terraform-project", "--format", "json",
+    ])
+    
+    assert main() == 0
+    payload = json.loads(capsys.readouterr().out)
+    assert [f["rule_id"] for f in payload["findings"]] == ["IRR-DEC-01"]